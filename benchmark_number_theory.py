@@ -0,0 +1,210 @@
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from number_theory import (
+    CRTBasis,
+    extended_gcd_half,
+    extended_gcd_iterative,
+    extended_gcd_recursive,
+    merge_congruences,
+    solve_general_crt,
+)
+
+# --- Configuration ---
+# Operand sizes (bits) for the modular inverse strategies
+INVERSE_BIT_SIZES = [64, 256, 1024, 4096, 16384, 65536, 100000]
+# Numbers of congruences for the CRT strategies (moduli are primes just above 2**31)
+CRT_SIZES = [2, 10, 100, 1000, 10000, 100000]
+CRT_MODULUS_START = 2 ** 31
+
+# Smaller sweep for a quick run
+QUICK_INVERSE_BIT_SIZES = [64, 256, 1024, 4096]
+QUICK_CRT_SIZES = [2, 10, 100, 1000]
+
+# Each measurement is the best of REPEATS runs. Once one run of a strategy takes
+# longer than TIME_BUDGET seconds, its larger sizes are skipped.
+REPEATS = 3
+TIME_BUDGET = 10.0
+
+DEFAULT_OUTPUT = "number_theory_benchmark.json"
+
+def _inverse_with(extended_gcd_function):
+    """mod_inverse() built on a specific extended GCD implementation."""
+    def inverse(a, m):
+        g, x, _ = extended_gcd_function(a, m)
+        if g != 1:
+            raise ValueError(f"Inverse of {a} mod {m} does not exist (a and m are not coprime)")
+        return x % m
+    return inverse
+
+def _crt_sequential(num, rem):
+    r, n = rem[0] % num[0], num[0]
+    for r_i, n_i in zip(rem[1:], num[1:]):
+        r, n = merge_congruences(r, n, r_i, n_i)
+    return r
+
+# Strategy name -> function(a, m) returning a^-1 mod m
+INVERSE_STRATEGIES = {
+    'recursive': _inverse_with(extended_gcd_recursive),
+    'iterative': _inverse_with(extended_gcd_iterative),
+    'half_gcd': _inverse_with(extended_gcd_half),
+    'builtin': lambda a, m: pow(a, -1, m),
+}
+
+# Strategy name -> (setup(num), solve(prepared, rem)). Only solve() is timed,
+# so 'garner_solve' measures a reused basis and 'garner' includes building it.
+CRT_STRATEGIES = {
+    'garner': (lambda num: num, lambda num, rem: CRTBasis(num).solve(rem)),
+    'garner_solve': (CRTBasis, lambda basis, rem: basis.solve(rem)),
+    'tree': (lambda num: num, lambda num, rem: solve_general_crt(num, rem)[0]),
+    'sequential': (lambda num: num, _crt_sequential),
+}
+
+def primes_above(start, count):
+    """The first 'count' primes >= start, found with a segmented sieve."""
+    # Small primes up to sqrt of the end of the window
+    window = max(1024, int(count * np.log(start) * 1.3))
+    limit = int((start + window) ** 0.5) + 1
+    small = np.ones(limit + 1, dtype=bool)
+    small[:2] = False
+    for p in range(2, int(limit ** 0.5) + 1):
+        if small[p]:
+            small[p * p::p] = False
+    small_primes = np.flatnonzero(small)
+
+    primes = []
+    while len(primes) < count:
+        segment = np.ones(window, dtype=bool)
+        for p in small_primes:
+            first = max(p * p, -(-start // p) * p)
+            segment[first - start::p] = False
+        primes.extend(int(start + i) for i in np.flatnonzero(segment))
+        start += window
+    return primes[:count]
+
+def _best_time(function, args, repeats):
+    """Best wall-clock time of up to 'repeats' calls (stops early past TIME_BUDGET), and the last result."""
+    best, result = float('inf'), None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+        if best > TIME_BUDGET:
+            break
+    return best, result
+
+def _measure(kind, strategy, size, function, args, expected, repeats, over_budget):
+    """Runs one measurement and returns its result record."""
+    record = {'kind': kind, 'strategy': strategy, 'size': size, 'seconds': None, 'status': 'ok'}
+    if strategy in over_budget:
+        record['status'] = 'skipped'
+        return record
+    try:
+        record['seconds'], result = _best_time(function, args, repeats)
+        if result != expected:
+            record['status'] = 'mismatch'
+    except RecursionError:
+        record['status'] = 'recursion-limit'
+    except ValueError as e:
+        record['status'] = f'error: {e}'
+    if record['seconds'] is not None and record['seconds'] > TIME_BUDGET:
+        over_budget.add(strategy)
+    return record
+
+def benchmark_inverse(bit_sizes=INVERSE_BIT_SIZES, repeats=REPEATS, seed=0):
+    """Times every inverse strategy on random operands of each size. Returns a list of records."""
+    rng = random.Random(seed)
+    records, over_budget = [], set()
+    for bits in bit_sizes:
+        m = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        a = rng.randrange(2, m)
+        while math.gcd(a, m) != 1:
+            a = rng.randrange(2, m)
+        expected = pow(a, -1, m)
+        for name, function in INVERSE_STRATEGIES.items():
+            records.append(_measure('inverse', name, bits, function, (a, m), expected, repeats, over_budget))
+            print(f"  inverse {name:>12} {bits:>7} bits: {_describe(records[-1])}")
+    return records
+
+def benchmark_crt(sizes=CRT_SIZES, repeats=REPEATS, seed=0):
+    """Times every CRT strategy on k coprime moduli for each k. Returns a list of records."""
+    rng = random.Random(seed)
+    all_moduli = primes_above(CRT_MODULUS_START, max(sizes))
+    records, over_budget = [], set()
+    for k in sizes:
+        num = all_moduli[:k]
+        x = rng.getrandbits(31 * k)
+        rem = [x % n for n in num]
+        expected = None
+        for name, (setup, solve) in CRT_STRATEGIES.items():
+            if name in over_budget:
+                records.append({'kind': 'crt', 'strategy': name, 'size': k, 'seconds': None, 'status': 'skipped'})
+            else:
+                started = time.perf_counter()
+                prepared = setup(num)
+                if time.perf_counter() - started > TIME_BUDGET:
+                    # An untimed setup this slow would make the next size unaffordable
+                    over_budget.add(name)
+                if expected is None:
+                    expected = solve(prepared, rem)
+                records.append(_measure('crt', name, k, solve, (prepared, rem), expected, repeats, over_budget))
+            print(f"  crt     {name:>12} k = {k:>6}: {_describe(records[-1])}")
+    return records
+
+def _describe(record):
+    if record['status'] != 'ok':
+        return record['status']
+    return f"{record['seconds'] * 1000:.3f} ms"
+
+def fastest_strategies(records):
+    """For each kind and size, the strategy with the lowest time: {kind: {size: strategy}}."""
+    fastest, best = {}, {}
+    for record in records:
+        if record['status'] != 'ok':
+            continue
+        key = (record['kind'], record['size'])
+        if key not in best or record['seconds'] < best[key]:
+            best[key] = record['seconds']
+            fastest.setdefault(record['kind'], {})[str(record['size'])] = record['strategy']
+    return fastest
+
+def run_benchmarks(bit_sizes=INVERSE_BIT_SIZES, crt_sizes=CRT_SIZES, repeats=REPEATS,
+                   output_path=DEFAULT_OUTPUT, seed=0):
+    """Runs both benchmark families and writes the results as JSON. Returns the report dict."""
+    records = benchmark_inverse(bit_sizes, repeats, seed) + benchmark_crt(crt_sizes, repeats, seed)
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'time_budget_seconds': TIME_BUDGET,
+        'results': records,
+        'fastest': fastest_strategies(records),
+    }
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def main():
+    """Asks for the sweep size and output file, then runs the benchmarks."""
+    print("--- ⏱️ Number Theory Benchmark ---")
+    full = input("Run the full sweep up to 100k bits and k = 10^5? (y/N): ").strip().lower() == 'y'
+    output_path = input(f"Output file [{DEFAULT_OUTPUT}]: ").strip() or DEFAULT_OUTPUT
+
+    if full:
+        report = run_benchmarks(output_path=output_path)
+    else:
+        report = run_benchmarks(QUICK_INVERSE_BIT_SIZES, QUICK_CRT_SIZES, output_path=output_path)
+
+    print(f"\n✅ Results written to {output_path}")
+    for kind, sizes in report['fastest'].items():
+        print(f"Fastest {kind}: " + ', '.join(f"{size}: {name}" for size, name in sizes.items()))
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
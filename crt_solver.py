@@ -1,62 +1,15 @@
-import math
+from number_theory import (
+    CRTBasis,
+    chinese_remainder_theorem,
+    crt_basis,
+    extended_gcd,
+    merge_congruences,
+    mod_inverse,
+    solve_general_crt,
+)
 
-def extended_gcd(a, b):
-    """
-    Implements the Extended Euclidean Algorithm.
-    Returns a tuple (g, x, y) such that a*x + b*y = g = gcd(a, b).
-    """
-    if a == 0:
-        return (b, 0, 1)
-    
-    g, x1, y1 = extended_gcd(b % a, a)
-    
-    # Update x and y using the results from the recursive call
-    x = y1 - (b // a) * x1
-    y = x1
-    
-    return (g, x, y)
-
-def mod_inverse(a, m):
-    """
-    Finds the modular multiplicative inverse a^-1 mod m.
-    Returns -1 if the inverse does not exist.
-    """
-    g, x, y = extended_gcd(a, m)
-    
-    if g != 1:
-        # Modular inverse exists only if gcd(a, m) = 1
-        raise ValueError("Modular inverse does not exist (a and m are not coprime)")
-    
-    # Ensure the result is positive and in the range [0, m-1]
-    return x % m
-
-def chinese_remainder_theorem(num, rem):
-    """
-    Solves the system of congruences:
-    x = rem[i] (mod num[i])
-    where num[i] are the moduli and rem[i] are the remainders.
-    """
-    # 1. Calculate the product M of all moduli (N in the formula)
-    M = 1
-    for n in num:
-        M *= n
-        
-    # 2. Compute the solution x
-    result = 0
-    for n_i, r_i in zip(num, rem):
-        
-        # M_i = M / n_i
-        M_i = M // n_i
-        
-        # M_i_inv = M_i^-1 mod n_i (Modular Inverse)
-        M_i_inv = mod_inverse(M_i, n_i)
-        
-        # Term to add: r_i * M_i * M_i_inv
-        term = r_i * M_i * M_i_inv
-        
-        result = (result + term) % M
-
-    return result
+# The solver functions live in number_theory.py and are re-exported here for
+# existing callers; this script keeps the interactive menu.
 
 def run_crt_menu():
     """
@@ -87,19 +40,13 @@ def run_crt_menu():
             num.append(n_i)
             rem.append(r_i)
 
-        # Quick check for pairwise coprimality (not strictly necessary for the code to run, 
-        # but CRT assumes it for a unique solution).
-        for i in range(k):
-            for j in range(i + 1, k):
-                if math.gcd(num[i], num[j]) != 1:
-                    print("\n Warning: The moduli are not pairwise coprime.")
-                    print("The standard CRT guarantees a unique solution only for coprime moduli.")
-                    # We proceed with the calculation anyway, which solves the general system of congruences
-
-        solution = chinese_remainder_theorem(num, rem)
-        M = 1
-        for n in num:
-            M *= n
+        # The moduli do not have to be coprime: congruences are merged, and an
+        # inconsistent system is reported instead of giving a wrong answer
+        try:
+            solution, M = solve_general_crt(num, rem)
+        except ValueError as e:
+            print(f"\n No Solution: {e}")
+            return
 
         print("\n Solution Found")
         print(f"The smallest non-negative solution x is: {solution}")
@@ -1,52 +1,17 @@
-import math
+from number_theory import extended_gcd, mod_inverse, solve_general_crt
 
-def extended_gcd(a, b):
-    # Implements the Extended Euclidean Algorithm: a*x + b*y = gcd(a, b)
-    # Returns (g, x, y)
-    if a == 0:
-        return (b, 0, 1)
-    
-    g, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return (g, x, y)
-
-def mod_inverse(a, m):
-    # Finds a^-1 mod m
-    g, x, _ = extended_gcd(a, m)
-    if g != 1:
-        # Raises an error if inverse doesn't exist (moduli are not coprime)
-        raise ValueError(f"Inverse of {a} mod {m} does not exist!")
-    return x % m
+# extended_gcd and mod_inverse used to be defined here; they now live in
+# number_theory.py and are re-exported for existing callers.
 
 def solve_crt(num, rem):
     """
     Solves the system x = rem[i] (mod num[i])
     num: list of moduli (n_i)
     rem: list of remainders (a_i)
+    Returns (x, M). A one-off solve, so it goes through number_theory's
+    solve_general_crt() rather than building a Garner basis.
     """
-    # 1. Calculate N (Total Modulus)
-    N = 1
-    for n in num:
-        N *= n
-        
-    # 2. Compute the result x
-    result = 0
-    for n_i, r_i in zip(num, rem):
-        
-        # M_i = N / n_i
-        M_i = N // n_i
-        
-        # M_i_inv = M_i^-1 mod n_i
-        M_i_inv = mod_inverse(M_i, n_i)
-        
-        # Add a_i * M_i * M_i_inv to the sum
-        term = r_i * M_i * M_i_inv
-        
-        # Accumulate the result modulo N
-        result = (result + term) % N
-
-    return result, N
+    return solve_general_crt(num, rem)
 
 # --- Menu Driven Execution for Demonstration ---
 
@@ -67,12 +32,11 @@ def main():
             r = int(input(f"Enter remainder r[{i+1}]: "))
             n = int(input(f"Enter modulus n[{i+1}]: "))
             if n <= 0: raise ValueError("Modulus must be positive.")
-            if i > 0 and any(math.gcd(n, existing_n) != 1 for existing_n in num):
-                 print("\n⚠️ Warning: Moduli must be coprime for unique solution.")
             num.append(n)
             rem.append(r)
             
-        solution, total_modulus = solve_crt(num, rem)
+        # Works for non-coprime moduli too; raises ValueError if the system has no solution
+        solution, total_modulus = solve_general_crt(num, rem)
         
         print("\n✅ Solution Found")
         print(f"The smallest positive solution x is: {solution}")
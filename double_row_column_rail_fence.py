@@ -1,5 +1,7 @@
 import math
 
+from transposition import BLOCK_SIZE, DOUBLE_RAIL_FENCE, crack_rails, transpose, transpose_file
+
 def double_rail_fence_encrypt(plaintext: str, rails: int) -> str:
     """
     Encrypts the plaintext using the Double Row Column Rail Fence cipher.
@@ -11,45 +13,9 @@ def double_rail_fence_encrypt(plaintext: str, rails: int) -> str:
     Returns:
         The resulting ciphertext.
     """
-    n = len(plaintext)
-    
-    # 1. Standard Rail Fence Transposition (Rows)
-    
-    grid = [['' for _ in range(n)] for _ in range(rails)]
-    
-    row, col = 0, 0
-    direction_down = True
-    
-    for char in plaintext:
-        grid[row][col] = char
-        col += 1
-        
-        if row == 0:
-            direction_down = True
-        elif row == rails - 1:
-            direction_down = False
-            
-        if direction_down:
-            row += 1
-        else:
-            row -= 1
-
-    # Read the grid row by row to get the intermediate ciphertext
-    intermediate_ciphertext = []
-    for r in range(rails):
-        for c in range(n):
-            if grid[r][c] != '':
-                intermediate_ciphertext.append(grid[r][c])
-                
-    # 2. Columnar Transposition (Simplified block-based read)
-    
-    final_ciphertext_blocks = ['' for _ in range(rails)]
-    
-    for i, char in enumerate(intermediate_ciphertext):
-        block_index = i % rails
-        final_ciphertext_blocks[block_index] += char
-        
-    return "".join(final_ciphertext_blocks)
+    # Stage 1 (rail fence rows) and stage 2 (columnar block read) are composed
+    # into one cached permutation, so the whole cipher is a single gather
+    return transpose(plaintext, rails, DOUBLE_RAIL_FENCE)
 
 
 def double_rail_fence_decrypt(ciphertext: str, rails: int) -> str:
@@ -63,81 +29,50 @@ def double_rail_fence_decrypt(ciphertext: str, rails: int) -> str:
     Returns:
         The resulting plaintext.
     """
-    n = len(ciphertext)
-    
-    # 1. Reverse Columnar Transposition
-    
-    base_len = n // rails
-    remainder = n % rails
-    
-    col_lengths = [base_len + 1] * remainder + [base_len] * (rails - remainder)
-    
-    blocks = []
-    start_index = 0
-    for length in col_lengths:
-        blocks.append(ciphertext[start_index:start_index + length])
-        start_index += length
-        
-    intermediate_plaintext = [''] * n
-    block_indices = [0] * rails
-    
-    for i in range(n):
-        block_index = i % rails
-        
-        char = blocks[block_index][block_indices[block_index]]
-        intermediate_plaintext[i] = char
-        
-        block_indices[block_index] += 1
-        
-    intermediate_plaintext = "".join(intermediate_plaintext)
-    
-    # 2. Reverse Standard Rail Fence Transposition (Rows)
-    
-    grid_pos = [['\n' for _ in range(n)] for _ in range(rails)]
-    
-    row, col = 0, 0
-    direction_down = True
-    
-    for i in range(n):
-        grid_pos[row][col] = '*'
-        col += 1
-        
-        if row == 0:
-            direction_down = True
-        elif row == rails - 1:
-            direction_down = False
-            
-        if direction_down:
-            row += 1
-        else:
-            row -= 1
-
-    index = 0
-    for r in range(rails):
-        for c in range(n):
-            if grid_pos[r][c] == '*':
-                grid_pos[r][c] = intermediate_plaintext[index]
-                index += 1
-                
-    final_plaintext = []
-    row, col = 0, 0
-    direction_down = True
-    
-    for i in range(n):
-        final_plaintext.append(grid_pos[row][col])
-        col += 1
-        
-        if row == 0:
-            direction_down = True
-        elif row == rails - 1:
-            direction_down = False
-            
-        if direction_down:
-            row += 1
-        else:
-            row -= 1
-            
-    return "".join(final_plaintext)
+    # Undo both stages at once with the inverse of the composed permutation
+    return transpose(ciphertext, rails, DOUBLE_RAIL_FENCE, mode='decrypt')
+
+def double_rail_fence_crack(ciphertext: str, max_rails: int = None, top: int = 5, workers: int = None) -> list:
+    """
+    Decrypts a ciphertext whose number of rails is unknown.
+
+    Every rail count from 2 to len(ciphertext) - 1 is tried, spread across
+    worker processes, and the candidates are ranked by how English they look.
+
+    Args:
+        ciphertext: The message to decrypt.
+        max_rails: Largest rail count to try (default: len(ciphertext) - 1).
+        top: Number of candidates to return.
+
+    Returns:
+        A list of (rails, score, plaintext) tuples, best first.
+    """
+    return crack_rails(ciphertext, DOUBLE_RAIL_FENCE, max_rails=max_rails, top=top, workers=workers)
+
+
+def double_rail_fence_encrypt_file(input_path: str, output_path: str, rails: int,
+                                   block_size: int = BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Encrypts a file of any size with the Double Row Column Rail Fence cipher.
+
+    The file is memory-mapped and transposed in independent blocks of block_size
+    bytes, spread over worker processes (see transposition.transpose_file).
+
+    Returns:
+        The number of bytes processed.
+    """
+    return transpose_file(input_path, output_path, rails, DOUBLE_RAIL_FENCE, 'encrypt', block_size, workers)
+
+
+def double_rail_fence_decrypt_file(input_path: str, output_path: str, rails: int,
+                                   block_size: int = BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Decrypts a file written by double_rail_fence_encrypt_file (same rails and block_size).
+
+    Returns:
+        The number of bytes processed.
+    """
+    return transpose_file(input_path, output_path, rails, DOUBLE_RAIL_FENCE, 'decrypt', block_size, workers)
 
 # --- User Input and Execution ---
 
@@ -0,0 +1,166 @@
+import string
+from functools import lru_cache
+
+import numpy as np
+
+# --- Configuration ---
+STANDARD_ALPHABET = string.ascii_uppercase
+
+# Relative frequency (percent) of each letter in English text, A ... Z.
+ENGLISH_LETTER_FREQUENCIES = {
+    'A': 8.167, 'B': 1.492, 'C': 2.782, 'D': 4.253, 'E': 12.702, 'F': 2.228,
+    'G': 2.015, 'H': 6.094, 'I': 6.966, 'J': 0.153, 'K': 0.772, 'L': 4.025,
+    'M': 2.406, 'N': 6.749, 'O': 7.507, 'P': 1.929, 'Q': 0.095, 'R': 5.987,
+    'S': 6.327, 'T': 9.056, 'U': 2.758, 'V': 0.978, 'W': 2.360, 'X': 0.150,
+    'Y': 1.974, 'Z': 0.074,
+}
+
+# Relative frequency (percent) of the most common English bigrams.
+# Bigrams that are not listed are treated as rare (see bigram_log_probabilities).
+ENGLISH_BIGRAM_FREQUENCIES = {
+    'TH': 3.56, 'HE': 3.07, 'IN': 2.43, 'ER': 2.05, 'AN': 1.99, 'RE': 1.85,
+    'ON': 1.76, 'AT': 1.49, 'EN': 1.45, 'ND': 1.35, 'TI': 1.34, 'ES': 1.34,
+    'OR': 1.28, 'TE': 1.20, 'OF': 1.17, 'ED': 1.17, 'IS': 1.13, 'IT': 1.12,
+    'AL': 1.09, 'AR': 1.07, 'ST': 1.05, 'TO': 1.04, 'NT': 1.04, 'NG': 0.95,
+    'SE': 0.93, 'HA': 0.93, 'AS': 0.87, 'OU': 0.87, 'IO': 0.83, 'LE': 0.83,
+    'VE': 0.83, 'CO': 0.79, 'ME': 0.79, 'DE': 0.76, 'HI': 0.76, 'RI': 0.73,
+    'RO': 0.73, 'IC': 0.70, 'NE': 0.69, 'EA': 0.69, 'RA': 0.69, 'CE': 0.65,
+    'LI': 0.62, 'CH': 0.60, 'LL': 0.58, 'BE': 0.58, 'MA': 0.57, 'SI': 0.55,
+    'OM': 0.55, 'UR': 0.54,
+}
+
+# Plain English text used to build n-gram tables when no corpus or counts file is given.
+# A larger corpus (or a published quadgram counts file) gives better scores.
+SAMPLE_TEXT = """
+The old lighthouse stood at the end of a narrow stone pier, and for more than a hundred years its keepers had climbed the same spiral stairs every evening to light the lamp. The last keeper was a quiet man who kept a journal of the weather, the ships that passed and the birds that rested on the rail. When the light was finally made automatic, he moved into a small cottage in the village and spent his afternoons walking along the cliffs, still watching the sea as if it were his duty.
+
+People in the village often asked him what he had learned from so many years alone. He would think for a while before he answered. He said that the sea was never the same twice, that a good map was worth more than a strong engine, and that most problems could be solved if you were patient enough to wait for the morning. The children thought he knew everything about ships, and in a way they were right.
+
+Science begins with careful observation. A student who wants to understand how plants grow might start by measuring the height of a seedling each day and writing the results in a notebook. After a few weeks the numbers form a pattern, and the pattern suggests a question. Does the plant grow faster in sunlight or in shade? Does it need more water when the air is warm? Each question leads to an experiment, and each experiment produces new information that must be checked against what is already known.
+
+The history of mathematics is full of ideas that were discovered long before anyone found a practical use for them. The properties of prime numbers were studied for their own sake for thousands of years, and only recently have they become the foundation of the methods that protect our messages and our money. A number that cannot be divided evenly by any smaller number except one seems like a simple thing, yet the question of how such numbers are distributed remains one of the great open problems of the subject.
+
+Secret writing is almost as old as writing itself. Military commanders in the ancient world replaced each letter of a message with another letter so that a captured courier could not reveal the plan. This kind of substitution is easy to use but also easy to break, because every language has its own rhythm. In English the letter E appears more often than any other, followed by T, A, O, I and N. Common words such as THE, AND, THAT and WITH leave clear traces, and a patient reader can recover the whole message by counting letters and guessing words.
+
+During the long winter the river froze so thick that the farmers could drive their carts across it. Merchants set up stalls on the ice and sold hot bread, roasted chestnuts and warm cider to the crowds that came out to skate. At night the fires along the banks made the whole valley glow, and the sound of music and laughter carried far across the frozen fields. When the thaw came in the spring, the ice broke with a noise like thunder, and the water rose quickly over the low meadows.
+
+Every good story needs a problem that must be solved. The hero wants something, and something stands in the way. Sometimes the obstacle is a person, sometimes it is the weather or a mountain, and sometimes it is a weakness in the hero's own character. The reader keeps turning the pages because they want to know whether the hero will succeed, and what the effort will cost. The best endings feel both surprising and inevitable, as though they could not have happened in any other way.
+
+The city council met on the first Monday of every month to discuss the budget, the condition of the roads and the plans for the new library. Most meetings were long and rather dull, but this one was different. A group of students had written a report showing that the old bridge was no longer safe, and they presented their measurements with charts and photographs. The members listened carefully, asked many questions, and finally agreed that the bridge should be closed until it could be repaired.
+
+A computer program is a set of instructions that tells a machine exactly what to do. The instructions must be precise, because the machine will follow them without thinking about what the programmer really meant. A small mistake in a single line can cause the whole program to fail, or worse, to produce results that look correct but are wrong. For this reason good programmers test their work with many different inputs and write their code so that other people can read and understand it.
+
+My grandmother kept a garden behind her house where she grew beans, tomatoes, potatoes and all kinds of flowers. She knew the name of every plant and could tell from the colour of a leaf whether it needed more water or more sun. In the summer we helped her pick the fruit and carry the baskets into the kitchen, where she made jam that lasted through the whole winter. She said that a garden teaches you to plan ahead, to work steadily and to accept that some years the harvest will be poor no matter what you do.
+
+Travel by sea was slow and dangerous in those days. A voyage across the ocean could take several months, and the sailors had to carry enough food and fresh water for the entire journey. Storms could tear the sails and break the masts, and a ship that was blown off course might never be seen again. Yet thousands of people made the journey every year, hoping to find land, work and a better life on the other side. Their letters home describe the fear, the boredom and the joy of arriving at last in a strange new country.
+
+Music has the power to change the way we feel in a matter of seconds. A slow melody played on a single violin can make a room full of strangers fall silent, while a fast rhythm on a drum makes people want to get up and dance. Musicians spend years practising scales and exercises so that their fingers will move without thought, leaving their minds free to listen and to respond to the other players. The result, when everything works, is something that none of them could have created alone.
+"""
+
+# Lookup table: ASCII byte -> letter index (A/a = 0 ... Z/z = 25, 255 = not a letter)
+_BYTE_TO_INDEX = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(STANDARD_ALPHABET):
+    _BYTE_TO_INDEX[ord(_c)] = _BYTE_TO_INDEX[ord(_c.lower())] = _i
+
+# Index of coincidence of English text and of uniformly random letters.
+ENGLISH_IC = 0.0667
+RANDOM_IC = 1 / 26
+
+def letter_probabilities():
+    """Returns the English letter distribution as a NumPy array of 26 probabilities (A=0)."""
+    freqs = np.array([ENGLISH_LETTER_FREQUENCIES[c] for c in STANDARD_ALPHABET])
+    return freqs / freqs.sum()
+
+def bigram_log_probabilities(floor=0.01):
+    """
+    Returns a (26, 26) array of log10 bigram probabilities, indexed [first][second].
+    Bigrams missing from ENGLISH_BIGRAM_FREQUENCIES get the 'floor' frequency (percent).
+    """
+    table = np.full((26, 26), floor)
+    for bigram, freq in ENGLISH_BIGRAM_FREQUENCIES.items():
+        table[STANDARD_ALPHABET.index(bigram[0]), STANDARD_ALPHABET.index(bigram[1])] = freq
+    return np.log10(table / table.sum())
+
+def text_to_indices(text, dtype=np.int64):
+    """
+    Converts text to a NumPy array of letter indices (A=0 ... Z=25). Case is ignored
+    and non-letters are dropped. 'text' may be a str or any buffer of ASCII bytes
+    (bytes, bytearray, memoryview, mmap). Non-ASCII strings are upper-cased before
+    the other characters are dropped, so 'ß' counts as 'SS'.
+
+    This is the one text -> index conversion shared by the cipher and statistics scripts.
+    """
+    if isinstance(text, str):
+        if not text.isascii():
+            text = text.upper()
+        text = text.encode('ascii', 'ignore')
+    indices = _BYTE_TO_INDEX[np.frombuffer(text, dtype=np.uint8)]
+    return indices[indices != 255].astype(dtype, copy=False)
+
+def ngram_codes(letters, n):
+    """Base-26 codes of the overlapping n-grams of an array of letter indices."""
+    count = max(len(letters) - n + 1, 0)
+    codes = np.zeros(count, dtype=np.int64)
+    for i in range(n):
+        codes = codes * 26 + letters[i:count + i]
+    return codes
+
+def count_ngrams(text, n):
+    """Counts the n-grams of the letters in 'text'. Returns an array of 26**n counts."""
+    return np.bincount(ngram_codes(text_to_indices(text), n), minlength=26 ** n)
+
+def load_ngram_counts(path, n):
+    """
+    Loads n-gram counts from a text file with one 'NGRAM COUNT' pair per line
+    (the format of the widely published english_quadgrams.txt files).
+    """
+    counts = np.zeros(26 ** n, dtype=np.int64)
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) != 2 or len(parts[0]) != n:
+                continue
+            code = 0
+            for c in parts[0].upper():
+                code = code * 26 + STANDARD_ALPHABET.index(c)
+            counts[code] += int(parts[1])
+    return counts
+
+@lru_cache(maxsize=8)
+def ngram_log_probabilities(n, counts_path=None):
+    """
+    Returns a flat array of 26**n log10 n-gram probabilities, indexed by the
+    base-26 code of the n-gram (e.g. for quadgrams: a*26^3 + b*26^2 + c*26 + d).
+
+    Counts are loaded from counts_path if given, otherwise taken from SAMPLE_TEXT.
+    Unseen n-grams get a floor of 0.01 counts.
+    """
+    counts = load_ngram_counts(counts_path, n) if counts_path else count_ngrams(SAMPLE_TEXT, n)
+    counts = counts.astype(np.float64)
+    total = counts.sum()
+    counts[counts == 0] = 0.01
+    return np.log10(counts / total)
+
+@lru_cache(maxsize=8)
+def interpolated_log_probabilities(n, counts_path=None):
+    """
+    Returns a flat array of 26**n log10 probabilities of the last letter of each
+    n-gram given the letters before it, indexed like ngram_log_probabilities().
+
+    Each order is mixed with the next shorter one by Witten-Bell interpolation, so an
+    n-gram missing from a small corpus such as SAMPLE_TEXT still scores by how common
+    its shorter tail is instead of all sharing one floor value.
+    """
+    counts = load_ngram_counts(counts_path, n) if counts_path else count_ngrams(SAMPLE_TEXT, n)
+    counts = counts.reshape((26,) * n).astype(np.float64)
+
+    unigrams = counts.sum(axis=tuple(range(n - 1))) + 0.5
+    probs = unigrams / unigrams.sum()
+    for m in range(2, n + 1):
+        # m-gram counts are the n-gram counts summed over the leading letters
+        grams = counts.sum(axis=tuple(range(n - m)))
+        context = grams.sum(axis=-1, keepdims=True)
+        distinct = (grams > 0).sum(axis=-1, keepdims=True)
+        weight = context / np.maximum(context + distinct, 1)
+        probs = weight * grams / np.maximum(context, 1) + (1 - weight) * probs
+    return np.log10(probs).ravel()
@@ -1,51 +1,29 @@
+from number_theory import batch_inverse as _batch_inverse
+from number_theory import extended_gcd, mod_inverse
+
+# The algorithms live in number_theory.py (shared with the CRT and RSA scripts).
+# This script keeps its own conventions: no inverse is reported as -1.
+
 # Function to perform the Extended Euclidean Algorithm (EEA).
 # It finds integers x and y such that s*x + t*y = gcd(s, t).
 def extended_euclidean(s, t):
-    # Base case of the recursion.
-    # If the first number (s) is 0, the GCD is the second number (t).
-    # The equation becomes: t*0 + t*1 = t
-    if s == 0:
-        # Return: (gcd, x, y) -> (t, 0, 1)
-        return t, 0, 1
-    
-    # Recursive step: Apply the algorithm to (t % s) and s.
-    # The coefficients (x1, y1) returned satisfy: (t % s)*x1 + s*y1 = gcd(s, t)
-    g, x1, y1 = extended_euclidean(t % s, s)
-
-    # Use the identity t % s = t - (t // s) * s to find the new x and y.
-    # Substitute the identity into the previous equation and rearrange terms:
-    # (t - (t // s) * s) * x1 + s * y1 = g
-    # s * (y1 - (t // s) * x1) + t * x1 = g
-    
-    # The new coefficient for s (x) is: y1 - (t // s) * x1
-    x = y1 - (t // s) * x1
-    # The new coefficient for t (y) is: x1
-    y = x1
-
-    # Return the GCD and the current coefficients (x, y)
-    return g, x, y
+    # Return: (gcd, x, y)
+    return extended_gcd(s, t)
 
 # Function to find the Multiplicative Inverse of 'a' modulo 'm'.
 # Returns the inverse (0 <= inverse < m) or -1 if no inverse exists.
 def multiplicative_inverse(a, m):
-    # Step 1: Ensure 'a' is within the range [0, m-1]
-    a = a % m
-    if a < 0:
-        a += m
-
-    # Step 2: Run the Extended Euclidean Algorithm
-    # We are looking for x such that a*x + m*y = gcd(a, m)
-    g, x, y = extended_euclidean(a, m)
-    
-    # Step 3: Check if the inverse exists
-    if g != 1:
+    try:
+        return mod_inverse(a, m)
+    except ValueError:
         # The inverse exists ONLY if gcd(a, m) is 1 (a and m are coprime).
         return -1
-    else:
-        # Step 4: Adjust the coefficient 'x'
-        # 'x' is the inverse, but it might be negative.
-        # x % m ensures the result is in the range [0, m-1].
-        return x % m
+
+# Function to find the Multiplicative Inverses of many values modulo the same 'm'.
+# Uses Montgomery's trick: one modular inversion and 3*(n-1) multiplications in total.
+# Returns a list of inverses; values with no inverse get -1 (as in multiplicative_inverse).
+def batch_inverse(values, m):
+    return _batch_inverse(values, m, missing=-1)
 
 # --- Main Program Execution Block ---
 if __name__ == "__main__":
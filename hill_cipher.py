@@ -1,6 +1,8 @@
 import numpy as np
 import string
 
+from english_stats import text_to_indices as letter_indices
+
 # --- Configuration ---
 ALPHABET_SIZE = 26
 STANDARD_ALPHABET = string.ascii_uppercase
@@ -9,36 +11,84 @@ STANDARD_ALPHABET = string.ascii_uppercase
 char_to_int = {c: i for i, c in enumerate(STANDARD_ALPHABET)}
 int_to_char = {i: c for i, c in enumerate(STANDARD_ALPHABET)}
 
-def inverse_matrix_mod_26(matrix):
+def _extended_gcd(a, b):
+    """Iterative Extended Euclidean Algorithm. Returns (g, x, y) with a*x + b*y = g."""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+def _triangularize_mod(rows, modulus):
     """
-    Calculates the inverse of a matrix modulo 26.
-    This is the most complex part of the Hill Cipher.
+    Reduces the rows (list of lists of ints) to upper triangular form modulo 'modulus'
+    in place, using only unimodular row operations, and returns the determinant mod 'modulus'.
+    
+    The modulus does not have to be prime: instead of dividing by a pivot, two rows are
+    combined with their Bezout coefficients so the pivot becomes gcd(a, b) and the
+    entry below it becomes 0.
+    """
+    n = len(rows)
+    det = 1
+    for col in range(n):
+        for row in range(col + 1, n):
+            b = rows[row][col]
+            if b == 0:
+                continue
+            a = rows[col][col]
+            g, x, y = _extended_gcd(a, b)
+            a_g, b_g = a // g, b // g
+            # [[x, y], [-b/g, a/g]] has determinant 1, so the determinant is unchanged
+            rows[col], rows[row] = (
+                [(x * p + y * q) % modulus for p, q in zip(rows[col], rows[row])],
+                [(a_g * q - b_g * p) % modulus for p, q in zip(rows[col], rows[row])],
+            )
+        det = (det * rows[col][col]) % modulus
+    return det
+
+def determinant_mod(matrix, modulus=ALPHABET_SIZE):
+    """
+    Calculates the determinant of a square integer matrix modulo 'modulus' exactly
+    (no floating point, so it works for any key size).
     """
-    det = int(round(np.linalg.det(matrix)))
-    # Ensure determinant is positive
-    det = det % ALPHABET_SIZE
+    rows = [[int(v) % modulus for v in row] for row in np.asarray(matrix)]
+    return _triangularize_mod(rows, modulus)
+
+def inverse_matrix_mod(matrix, modulus=ALPHABET_SIZE):
+    """
+    Calculates the inverse of a square integer matrix modulo 'modulus' with integer
+    Gauss-Jordan elimination. Raises ValueError if the matrix is not invertible.
+    """
+    matrix = np.asarray(matrix)
+    n = matrix.shape[0]
     
-    # 1. Check if the modular inverse of the determinant exists (GCD must be 1)
-    # The modular inverse of 'det' modulo 26 is 'det_inv'.
-    det_inv = -1
-    for i in range(ALPHABET_SIZE):
-        if (det * i) % ALPHABET_SIZE == 1:
-            det_inv = i
-            break
-            
-    if det_inv == -1:
-        # Cannot be decrypted if the key is not invertible mod 26
-        raise ValueError(f"Key is not invertible (det={det}, GCD(det, 26) != 1). Choose a different key.")
-        
-    # 2. Calculate the matrix of cofactors, transpose it (adjugate)
-    adjugate = np.linalg.inv(matrix) * np.linalg.det(matrix)
-    # Rounding is crucial for floating point results
-    adjugate = np.round(adjugate).astype(int)
+    # 1. Build the augmented matrix [A | I] and reduce the left half to triangular form
+    rows = [[int(v) % modulus for v in row] + [int(i == j) for j in range(n)]
+            for i, row in enumerate(matrix)]
+    det = _triangularize_mod(rows, modulus)
     
-    # 3. Calculate the inverse matrix: adjugate * det_inv (mod 26)
-    inverse = (adjugate * det_inv) % ALPHABET_SIZE
+    # 2. The matrix is invertible only if the determinant is a unit (GCD(det, modulus) = 1)
+    if _extended_gcd(det, modulus)[0] != 1:
+        raise ValueError(f"Key is not invertible (det={det}, GCD(det, {modulus}) != 1). Choose a different key.")
     
-    return inverse
+    # 3. Back substitution: scale each pivot to 1 and clear the entries above it
+    for col in range(n - 1, -1, -1):
+        pivot_inv = pow(rows[col][col], -1, modulus)
+        rows[col] = [(v * pivot_inv) % modulus for v in rows[col]]
+        for row in range(col):
+            factor = rows[row][col]
+            if factor:
+                rows[row] = [(v - factor * p) % modulus for v, p in zip(rows[row], rows[col])]
+                
+    return np.array([row[n:] for row in rows], dtype=np.int64)
+
+def inverse_matrix_mod_26(matrix):
+    """
+    Calculates the inverse of a matrix modulo 26.
+    This is the most complex part of the Hill Cipher.
+    """
+    return inverse_matrix_mod(matrix, ALPHABET_SIZE)
 
 def preprocess_text(text, key_size, fill_char='X'):
     """
@@ -54,75 +104,184 @@ def preprocess_text(text, key_size, fill_char='X'):
         
     return text
 
+# Lookup table for the vectorized engine: letter index -> ASCII byte of the uppercase letter.
+_INDEX_TO_BYTE = np.frombuffer(STANDARD_ALPHABET.encode('ascii'), dtype=np.uint8)
+
+# Default chunk size (in characters) for the streaming mode.
+STREAM_CHUNK_SIZE = 1 << 20
+
+def text_to_indices(text):
+    """
+    Converts text (str or bytes) to a uint8 array of letter indices (A=0 ... Z=25).
+    Non-alphabetic characters are dropped and lowercase letters are folded to uppercase,
+    matching the cleaning done by preprocess_text().
+    """
+    return letter_indices(text, dtype=np.uint8)
+
+def indices_to_text(indices):
+    """Converts an array of letter indices back to an uppercase string."""
+    return _INDEX_TO_BYTE[np.asarray(indices, dtype=np.uint8).ravel()].tobytes().decode('ascii')
+
+def text_to_blocks(text, key_size, fill_char='X'):
+    """
+    Cleans and pads the text, returning a uint8 array of shape (n_blocks, key_size).
+    """
+    indices = text_to_indices(text)
+    padding = -len(indices) % key_size
+    if padding:
+        indices = np.concatenate([indices, np.full(padding, char_to_int[fill_char], dtype=np.uint8)])
+    return indices.reshape(-1, key_size)
+
+def apply_key(blocks, key_matrix):
+    """
+    Multiplies every block by the key matrix in a single operation: (blocks * K) mod 26.
+    Returns a uint8 array with the same shape as blocks.
+    """
+    key = np.asarray(key_matrix, dtype=np.int64) % ALPHABET_SIZE
+    return ((blocks.astype(np.int64) @ key) % ALPHABET_SIZE).astype(np.uint8)
+
 def encrypt_hill(plaintext, key_matrix):
     """
     Encrypts the plaintext using the Hill Cipher: C = P * K (mod 26).
+    key_matrix may be a NumPy array or a precompiled HillKey.
     """
-    key_size = key_matrix.shape[0]
-    processed_text = preprocess_text(plaintext, key_size)
-    
-    # Convert text to numerical vector blocks
-    P_blocks = [
-        [char_to_int[processed_text[i + j]] for j in range(key_size)] 
-        for i in range(0, len(processed_text), key_size)
-    ]
-    
-    ciphertext = []
-    
-    for P in P_blocks:
-        P_vector = np.array(P)
-        
-        # Matrix multiplication: C = P * K (mod 26)
-        # Result is a 1xN vector
-        C_vector = np.dot(P_vector, key_matrix) % ALPHABET_SIZE
-        
-        # Convert numerical result back to characters
-        ciphertext.extend([int_to_char[c] for c in C_vector])
-        
-    return "".join(ciphertext)
+    return _as_hill_key(key_matrix).encrypt(plaintext)
 
 def decrypt_hill(ciphertext, key_matrix):
     """
     Decrypts the ciphertext using the Hill Cipher: P = C * K_inv (mod 26).
+    key_matrix may be a NumPy array or a precompiled HillKey (which reuses its cached inverse).
     """
     try:
-        # Calculate the inverse of the key matrix mod 26
-        inverse_key = inverse_matrix_mod_26(key_matrix)
+        return _as_hill_key(key_matrix).decrypt(ciphertext)
     except ValueError as e:
         return f"DECRYPTION FAILED: {e}"
 
-    key_size = key_matrix.shape[0]
-    
-    # Decryption works on the raw ciphertext (must be multiple of key_size)
-    if len(ciphertext) % key_size != 0:
-         return "DECRYPTION FAILED: Ciphertext length must be a multiple of the key size."
-         
-    # Convert text to numerical vector blocks
-    C_blocks = [
-        [char_to_int[ciphertext[i + j]] for j in range(key_size)] 
-        for i in range(0, len(ciphertext), key_size)
-    ]
-    
-    plaintext = []
-    
-    for C in C_blocks:
-        C_vector = np.array(C)
-        
-        # Matrix multiplication: P = C * K_inv (mod 26)
-        P_vector = np.dot(C_vector, inverse_key) % ALPHABET_SIZE
-        
-        # Convert numerical result back to characters
-        plaintext.extend([int_to_char[p] for p in P_vector])
+class HillKey:
+    """
+    A compiled Hill cipher key. The key matrix is validated once and its inverse
+    mod 26 is computed on first use and cached, so the same key can decrypt many
+    messages (and arbitrarily large key sizes) without repeating the setup work.
+    """
+    def __init__(self, key_matrix):
+        self.matrix = np.asarray(key_matrix, dtype=np.int64) % ALPHABET_SIZE
+        if self.matrix.ndim != 2 or self.matrix.shape[0] != self.matrix.shape[1]:
+            raise ValueError("Key matrix must be square.")
+        self.size = self.matrix.shape[0]
+        self._inverse = None
+
+    @property
+    def determinant(self):
+        """Determinant of the key matrix modulo 26."""
+        return determinant_mod(self.matrix)
+
+    @property
+    def inverse(self):
+        """Inverse of the key matrix modulo 26 (raises ValueError if not invertible)."""
+        if self._inverse is None:
+            self._inverse = inverse_matrix_mod_26(self.matrix)
+        return self._inverse
+
+    def is_invertible(self):
+        """Returns True if the key can be used for decryption."""
+        try:
+            self.inverse
+        except ValueError:
+            return False
+        return True
+
+    def encrypt(self, plaintext):
+        """C = P * K (mod 26)"""
+        # Convert the cleaned text to an (n_blocks, key_size) array and multiply once
+        P_blocks = text_to_blocks(plaintext, self.size)
+        return indices_to_text(apply_key(P_blocks, self.matrix))
+
+    def decrypt(self, ciphertext):
+        """P = C * K_inv (mod 26). Raises ValueError on a bad key or ciphertext length."""
+        inverse_key = self.inverse
         
-    return "".join(plaintext)
+        # Decryption works on the raw ciphertext (must be multiple of key_size)
+        C_indices = text_to_indices(ciphertext)
+        if len(C_indices) % self.size != 0:
+            raise ValueError("Ciphertext length must be a multiple of the key size.")
+        return indices_to_text(apply_key(C_indices.reshape(-1, self.size), inverse_key))
+
+    def encrypt_stream(self, chunks):
+        """Encrypts an iterable of text chunks (see hill_stream)."""
+        return hill_stream(chunks, self.matrix)
+
+    def decrypt_stream(self, chunks):
+        """Decrypts an iterable of text chunks (see hill_stream)."""
+        return hill_stream(chunks, self.inverse, mode='decrypt')
+
+def _as_hill_key(key):
+    """Returns key unchanged if it is already a HillKey, otherwise compiles it."""
+    return key if isinstance(key, HillKey) else HillKey(key)
+
+def hill_stream(chunks, key_matrix, fill_char='X', mode='encrypt'):
+    """
+    Applies the key matrix to an iterable of text chunks (str or bytes), yielding the
+    output for each chunk as a string. A partial block at the end of a chunk is carried
+    over to the next one. When encrypting, the final partial block is padded with
+    fill_char, so the concatenated output equals encrypt_hill() on the whole text.
+
+    To decrypt a stream, pass the inverse key matrix and mode='decrypt': a partial
+    block left at the end then raises ValueError, as decrypt_hill() does.
+    """
+    key_size = np.shape(key_matrix)[0]
+    carry = np.empty(0, dtype=np.uint8)
+    
+    for chunk in chunks:
+        indices = text_to_indices(chunk)
+        if len(carry):
+            indices = np.concatenate([carry, indices])
+            
+        # Process only the complete blocks, keep the remainder for the next chunk
+        usable = len(indices) - len(indices) % key_size
+        carry = indices[usable:]
+        if usable:
+            yield indices_to_text(apply_key(indices[:usable].reshape(-1, key_size), key_matrix))
+            
+    if len(carry) and mode == 'decrypt':
+        raise ValueError("Ciphertext length must be a multiple of the key size.")
+    if len(carry):
+        padding = np.full(key_size - len(carry), char_to_int[fill_char], dtype=np.uint8)
+        last_block = np.concatenate([carry, padding]).reshape(1, key_size)
+        yield indices_to_text(apply_key(last_block, key_matrix))
+
+def _read_chunks(file, chunk_size):
+    """Yields successive chunks read from a binary file object."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def encrypt_hill_file(input_path, output_path, key_matrix, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Encrypts a file chunk by chunk with bounded memory, writing the ciphertext to output_path.
+    """
+    key = _as_hill_key(key_matrix)
+    with open(input_path, 'rb') as src, open(output_path, 'w') as dst:
+        for piece in key.encrypt_stream(_read_chunks(src, chunk_size)):
+            dst.write(piece)
+
+def decrypt_hill_file(input_path, output_path, key_matrix, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Decrypts a file chunk by chunk with bounded memory, writing the plaintext to output_path.
+    """
+    key = _as_hill_key(key_matrix)
+    with open(input_path, 'rb') as src, open(output_path, 'w') as dst:
+        for piece in key.decrypt_stream(_read_chunks(src, chunk_size)):
+            dst.write(piece)
 
 def get_key_matrix():
-    """Prompts user for the key matrix (2x2 or 3x3)."""
+    """Prompts user for the key matrix (any N >= 2)."""
     while True:
         try:
             size = int(input("Enter the key size (N for NxN matrix, e.g., 2 or 3): "))
-            if size <= 1 or size > 4:
-                 print("Key size must be 2, 3, or 4.")
+            if size <= 1:
+                 print("Key size must be 2 or greater.")
                  continue
                  
             print(f"Enter the {size*size} elements of the key matrix (row by row), separated by spaces:")
@@ -136,7 +295,7 @@ def get_key_matrix():
             key_matrix = np.array(matrix_elements).reshape(size, size)
             
             # Test invertibility immediately
-            det = int(round(np.linalg.det(key_matrix))) % ALPHABET_SIZE
+            det = determinant_mod(key_matrix)
             
             if np.gcd(det, ALPHABET_SIZE) != 1:
                 print(f"\n❌ WARNING: Determinant modulo 26 is {det}. GCD(det, 26) is not 1.")
@@ -159,6 +318,9 @@ def main():
     print(key_matrix)
     print(f"**Key Size (N):** {key_matrix.shape[0]}\n")
     
+    # Compile the key once so the inverse is not recomputed for every decryption
+    hill_key = HillKey(key_matrix)
+    
     while True:
         print("\n--- Menu ---")
         print("1. **Encrypt** a message")
@@ -170,7 +332,7 @@ def main():
         if choice == '1':
             # --- ENCRYPTION ---
             plaintext = input("Enter the message to **encrypt**: ")
-            ciphertext = encrypt_hill(plaintext, key_matrix)
+            ciphertext = encrypt_hill(plaintext, hill_key)
             
             print(f"\n   **Plaintext (Padded):** {preprocess_text(plaintext, key_matrix.shape[0])}")
             print(f"✅ **Ciphertext:** {ciphertext}")
@@ -178,7 +340,7 @@ def main():
         elif choice == '2':
             # --- DECRYPTION ---
             ciphertext = input("Enter the message to **decrypt**: ")
-            decrypted_text = decrypt_hill(ciphertext.upper(), key_matrix)
+            decrypted_text = decrypt_hill(ciphertext.upper(), hill_key)
             
             print(f"\n✅ **Decrypted Plaintext:** {decrypted_text}")
             
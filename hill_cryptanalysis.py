@@ -0,0 +1,306 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from english_stats import bigram_log_probabilities, letter_probabilities
+from hill_cipher import (
+    ALPHABET_SIZE,
+    apply_key,
+    indices_to_text,
+    inverse_matrix_mod,
+    inverse_matrix_mod_26,
+    text_to_blocks,
+    text_to_indices,
+)
+
+# --- Configuration ---
+# 26 = 2 * 13, so a matrix is invertible mod 26 exactly when it is invertible mod 2 and mod 13.
+PRIME_FACTORS = (2, 13)
+
+# Number of candidate block subsets tested together in one vectorized batch.
+CANDIDATE_BATCH_SIZE = 4096
+
+# Number of candidate decryption rows scored together in one vectorized batch.
+ROW_BATCH_SIZE = 8192
+
+# The ciphertext-only attack scores candidates on the first SCORE_BLOCKS blocks,
+# which is plenty for letter statistics, so its time and memory do not grow with
+# the ciphertext. Candidate decryption matrices are scored KEY_BATCH_SIZE at a time.
+SCORE_BLOCKS = 1024
+KEY_BATCH_SIZE = 1024
+
+def invertible_mod_prime(matrices, p):
+    """
+    Tests a whole batch of square matrices for invertibility modulo a prime p.
+
+    matrices: integer array of shape (batch, k, k).
+    Returns a boolean array of shape (batch,).
+
+    Gaussian elimination runs on every matrix at once: the loop is only over the
+    k columns, each step is a NumPy operation over the full batch.
+    """
+    m = np.array(matrices, dtype=np.int64) % p
+    batch, k, _ = m.shape
+    inverses = np.array([0] + [pow(v, -1, p) for v in range(1, p)], dtype=np.int64)
+    ok = np.ones(batch, dtype=bool)
+    rows = np.arange(batch)
+
+    for col in range(k):
+        # 1. Pick the first row at or below 'col' with a non-zero entry in this column
+        nonzero = m[:, col:, col] != 0
+        has_pivot = nonzero.any(axis=1)
+        ok &= has_pivot
+        pivot = col + nonzero.argmax(axis=1)
+
+        # 2. Swap it into place (a no-op where pivot == col)
+        pivot_rows = m[rows, pivot].copy()
+        m[rows, pivot] = m[:, col]
+        m[:, col] = pivot_rows
+
+        # 3. Normalise the pivot row and clear the column below it
+        m[:, col] = (m[:, col] * inverses[m[:, col, col]][:, None]) % p
+        factors = m[:, col + 1:, col][:, :, None]
+        m[:, col + 1:] = (m[:, col + 1:] - factors * m[:, col][:, None, :]) % p
+
+    return ok
+
+def invertible_mod_26(matrices):
+    """Tests a batch of (batch, k, k) matrices for invertibility modulo 26."""
+    ok = np.ones(len(matrices), dtype=bool)
+    for p in PRIME_FACTORS:
+        ok &= invertible_mod_prime(matrices, p)
+    return ok
+
+def rank_mod_prime(matrix, p):
+    """Rank of an integer matrix of shape (rows, k) modulo a prime p, by Gaussian elimination."""
+    m = np.array(matrix, dtype=np.int64) % p
+    rank = 0
+    for col in range(m.shape[1]):
+        nonzero = np.flatnonzero(m[rank:, col])
+        if len(nonzero) == 0:
+            continue
+        pivot = rank + nonzero[0]
+        m[[rank, pivot]] = m[[pivot, rank]]
+        m[rank] = (m[rank] * pow(int(m[rank, col]), -1, p)) % p
+        m[rank + 1:] = (m[rank + 1:] - m[rank + 1:, col:col + 1] * m[rank]) % p
+        rank += 1
+        if rank == len(m):
+            break
+    return rank
+
+def _candidate_subsets(n_blocks, key_size, rng):
+    """
+    Yields batches of candidate block index subsets, shape (batch, key_size).
+    Consecutive runs of blocks are tried first, then random subsets.
+    """
+    starts = np.arange(n_blocks - key_size + 1)
+    for i in range(0, len(starts), CANDIDATE_BATCH_SIZE):
+        yield starts[i:i + CANDIDATE_BATCH_SIZE, None] + np.arange(key_size)
+
+    while True:
+        # A row that repeats a block is singular, so it is simply rejected by the test
+        yield rng.integers(0, n_blocks, (CANDIDATE_BATCH_SIZE, key_size))
+
+def _solve_key_mod_prime(P_distinct, C_distinct, key_size, p, max_candidates, rng):
+    """
+    Solves K mod p from the first subset of distinct blocks whose plaintext matrix
+    P_s is invertible mod p: K = P_s^-1 * C_s (mod p). Returns None if none is found.
+    """
+    tested = 0
+    for subsets in _candidate_subsets(len(P_distinct), key_size, rng):
+        found = np.flatnonzero(invertible_mod_prime(P_distinct[subsets], p))
+        if len(found):
+            chosen = subsets[found[0]]
+            return (inverse_matrix_mod(P_distinct[chosen], p) @ C_distinct[chosen].astype(np.int64)) % p
+
+        tested += len(subsets)
+        if tested >= max_candidates:
+            return None
+
+def recover_key_known_plaintext(plaintext, ciphertext, key_size, max_candidates=1_000_000, seed=None):
+    """
+    Recovers the Hill key matrix K from aligned plaintext and ciphertext (C = P * K mod 26).
+
+    1. Both texts are split into blocks of key_size letters, and repeated
+       plaintext blocks are dropped (they cannot help to span the space).
+    2. For each prime factor p of 26, batches of candidate block subsets are tested
+       for invertibility mod p, and K mod p = P_s^-1 * C_s is solved from the first hit.
+       The subsets may differ: blocks can span the space mod 2 and mod 13 without
+       any single subset being invertible mod 26.
+    3. K mod 2 and K mod 13 are combined with the Chinese Remainder Theorem.
+    4. The key is verified against every known block.
+
+    Returns the key matrix as a NumPy array. Raises ValueError if no key is found,
+    in particular when the distinct plaintext blocks are rank-deficient mod 2 or 13.
+    """
+    P_blocks = text_to_blocks(plaintext, key_size)
+    C_indices = text_to_indices(ciphertext)
+    C_blocks = C_indices[:len(C_indices) - len(C_indices) % key_size].reshape(-1, key_size)
+
+    n_blocks = min(len(P_blocks), len(C_blocks))
+    if n_blocks < key_size:
+        raise ValueError(f"At least {key_size} aligned blocks are needed to recover a {key_size}x{key_size} key.")
+    P_blocks, C_blocks = P_blocks[:n_blocks], C_blocks[:n_blocks]
+
+    # The first occurrence of each distinct plaintext block, in text order
+    first = np.sort(np.unique(P_blocks, axis=0, return_index=True)[1])
+    P_distinct, C_distinct = P_blocks[first], C_blocks[first]
+    for p in PRIME_FACTORS:
+        rank = rank_mod_prime(P_distinct, p)
+        if rank < key_size:
+            raise ValueError(f"The known plaintext is rank-deficient: its {len(first)} distinct blocks only span "
+                             f"rank {rank} mod {p}, and {key_size} is needed. Use more varied known plaintext.")
+
+    rng = np.random.default_rng(seed)
+    key = np.zeros((key_size, key_size), dtype=np.int64)
+    for p in PRIME_FACTORS:
+        key_mod_p = _solve_key_mod_prime(P_distinct, C_distinct, key_size, p, max_candidates, rng)
+        if key_mod_p is None:
+            raise ValueError(f"No set of plaintext blocks invertible mod {p} was found. More known plaintext is needed.")
+        # CRT: the coefficient is 1 mod p and 0 mod every other prime factor
+        cofactor = ALPHABET_SIZE // p
+        key = (key + key_mod_p * cofactor * pow(cofactor, -1, p)) % ALPHABET_SIZE
+
+    if not np.array_equal(apply_key(P_blocks, key), C_blocks):
+        raise ValueError("Plaintext and ciphertext are not consistent with a single Hill key of this size.")
+    return key
+
+def _rows_from_codes(codes, key_size):
+    """Expands integer codes 0 ... 26^k - 1 into their base-26 digit rows, shape (len(codes), k)."""
+    powers = ALPHABET_SIZE ** np.arange(key_size - 1, -1, -1, dtype=np.int64)
+    return (codes[:, None] // powers) % ALPHABET_SIZE
+
+def score_rows(C_blocks, rows):
+    """
+    Scores candidate decryption rows against English letter frequencies.
+
+    With P = C * D (mod 26), plaintext letter j of every block depends only on
+    column j of D. For each candidate column v, the letters (C * v) mod 26 are
+    counted and compared to English with the chi-squared statistic (lower is better).
+    All candidates in 'rows' (shape (batch, k)) are evaluated at once.
+    """
+    letters = (C_blocks.astype(np.int64) @ rows.T) % ALPHABET_SIZE
+    n, batch = letters.shape
+    offsets = letters + ALPHABET_SIZE * np.arange(batch)
+    counts = np.bincount(offsets.ravel(), minlength=batch * ALPHABET_SIZE).reshape(batch, ALPHABET_SIZE)
+    expected = letter_probabilities() * n
+    return (((counts - expected) ** 2) / expected).sum(axis=1)
+
+def _best_rows_in_range(C_blocks, start, stop, keep):
+    """Worker: scores candidate codes [start, stop) and returns the 'keep' best (codes, scores)."""
+    key_size = C_blocks.shape[1]
+    best_codes = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0)
+
+    for batch_start in range(start, stop, ROW_BATCH_SIZE):
+        codes = np.arange(batch_start, min(batch_start + ROW_BATCH_SIZE, stop), dtype=np.int64)
+        scores = score_rows(C_blocks, _rows_from_codes(codes, key_size))
+
+        best_codes = np.concatenate([best_codes, codes])
+        best_scores = np.concatenate([best_scores, scores])
+        if len(best_scores) > keep:
+            top = np.argpartition(best_scores, keep)[:keep]
+            best_codes, best_scores = best_codes[top], best_scores[top]
+
+    return best_codes, best_scores
+
+def best_candidate_rows(C_blocks, keep, workers=None):
+    """
+    Searches all 26^k candidate decryption rows and returns the 'keep' best as an
+    array of shape (keep, k), best first. The search range is split across a process pool.
+    """
+    key_size = C_blocks.shape[1]
+    total = ALPHABET_SIZE ** key_size
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        codes, scores = _best_rows_in_range(C_blocks, 0, total, keep)
+    else:
+        bounds = np.linspace(0, total, workers + 1, dtype=np.int64)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_best_rows_in_range,
+                                    [C_blocks] * workers, bounds[:-1].tolist(), bounds[1:].tolist(),
+                                    [keep] * workers))
+        codes = np.concatenate([r[0] for r in results])
+        scores = np.concatenate([r[1] for r in results])
+
+    order = np.argsort(scores)[:keep]
+    return _rows_from_codes(codes[order], key_size)
+
+def score_keys(C_blocks, D_candidates, bigrams):
+    """English bigram score of the decryption of C_blocks under each candidate D, shape (batch,)."""
+    plaintexts = ((C_blocks.astype(np.int64) @ D_candidates) % ALPHABET_SIZE).reshape(len(D_candidates), -1)
+    return bigrams[plaintexts[:, :-1], plaintexts[:, 1:]].sum(axis=1)
+
+def break_hill_ciphertext_only(ciphertext, key_size, top_candidates=None, workers=None):
+    """
+    Recovers a Hill key from ciphertext alone.
+
+    1. Every candidate column of the decryption matrix D = K^-1 is scored on its own
+       (26^k candidates instead of 26^(k*k) keys).
+    2. The best candidates are arranged into k x k matrices in every order, and the
+       ones that are invertible mod 26 are scored on English bigrams.
+    3. The best D is inverted with inverse_matrix_mod_26 to give the key K.
+    Scoring only looks at the first SCORE_BLOCKS blocks of the ciphertext.
+
+    Returns (key_matrix, plaintext). Raises ValueError if no invertible key is found.
+    """
+    C_indices = text_to_indices(ciphertext)
+    C_blocks = C_indices[:len(C_indices) - len(C_indices) % key_size].reshape(-1, key_size)
+    if len(C_blocks) == 0:
+        raise ValueError("Ciphertext is too short.")
+
+    sample = C_blocks[:SCORE_BLOCKS]
+    top_candidates = top_candidates or 3 * key_size
+    rows = best_candidate_rows(sample, top_candidates, workers)
+
+    # Every ordered choice of k distinct candidates, as the columns of D
+    orders = np.array(list(itertools.permutations(range(len(rows)), key_size)))
+    D_candidates = rows[orders].transpose(0, 2, 1)
+    D_candidates = D_candidates[invertible_mod_26(D_candidates)]
+    if len(D_candidates) == 0:
+        raise ValueError("No invertible key found among the best candidates. Try a larger top_candidates.")
+
+    # Decrypt the sample with each batch of candidates and score adjacent letters as English bigrams
+    bigrams = bigram_log_probabilities()
+    scores = np.concatenate([score_keys(sample, D_candidates[i:i + KEY_BATCH_SIZE], bigrams)
+                             for i in range(0, len(D_candidates), KEY_BATCH_SIZE)])
+
+    best = D_candidates[np.argmax(scores)]
+    key_matrix = inverse_matrix_mod_26(best)
+    return key_matrix, indices_to_text(apply_key(C_blocks, best))
+
+def main():
+    """Menu-driven Hill cipher attacks."""
+    print("--- 🔓 Hill Cipher Cryptanalysis ---")
+    print("1. **Known-plaintext** attack")
+    print("2. **Ciphertext-only** attack")
+
+    choice = input("Enter your choice (1 or 2): ").strip()
+
+    try:
+        if choice == '1':
+            plaintext = input("Enter the known **plaintext**: ")
+            ciphertext = input("Enter the matching **ciphertext**: ")
+            key_size = int(input("Enter the key size (N for NxN matrix): "))
+            key_matrix = recover_key_known_plaintext(plaintext, ciphertext, key_size)
+        elif choice == '2':
+            ciphertext = input("Enter the **ciphertext**: ")
+            key_size = int(input("Enter the key size (N for NxN matrix): "))
+            key_matrix, plaintext = break_hill_ciphertext_only(ciphertext, key_size)
+            print(f"\n✅ **Recovered Plaintext:** {plaintext}")
+        else:
+            print("\n❌ Invalid choice.")
+            return
+    except ValueError as e:
+        print(f"\n❌ Attack failed: {e}")
+        return
+
+    print("\n✅ **Recovered Key Matrix (K):**")
+    print(key_matrix)
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
+import mmap
+import os
 import string
+from functools import lru_cache
 
 # Define the standard alphabet (used for reference)
 STANDARD_ALPHABET = string.ascii_uppercase
@@ -7,12 +10,89 @@ STANDARD_ALPHABET = string.ascii_uppercase
 # Using 'X' for 'A', 'N' for 'B', etc.
 DEFAULT_KEY = "XNBYHOCZTDJVSKGMELWRAPQIFU"
 
+# Chunk size (in bytes) used when translating files and streams.
+CHUNK_SIZE = 64 * 1024 * 1024
+
 def get_cipher_key():
     """Returns the substitution key used for the cipher."""
     # In a real-world scenario, you might prompt the user for a custom key
     # or generate a random one. For this example, we use a fixed default.
     return DEFAULT_KEY
 
+@lru_cache(maxsize=32)
+def _str_translation_table(source, target):
+    """Cached str.maketrans table, so repeated calls with the same key don't rebuild it."""
+    return str.maketrans(source, target)
+
+def compile_byte_table(key, decrypt=False):
+    """
+    Compiles the key into a 256-entry bytes translation table for bytes.translate().
+
+    Lowercase letters are mapped as if uppercased first (same result as the str functions),
+    and every other byte is left unchanged.
+
+    :param key: The 26-character substitution alphabet (string).
+    :param decrypt: Build the inverse (KEY -> STANDARD_ALPHABET) table instead.
+    :return: A 256-byte translation table (bytes).
+    """
+    key = key.upper()
+    source, target = (key, STANDARD_ALPHABET) if decrypt else (STANDARD_ALPHABET, key)
+
+    table = bytearray(range(256))
+    for src_char, dst_char in zip(source, target):
+        table[ord(src_char)] = ord(dst_char)
+        table[ord(src_char.lower())] = ord(dst_char)
+    return bytes(table)
+
+def translate_stream(src, dst, table, chunk_size=CHUNK_SIZE):
+    """
+    Translates a binary stream (file object, pipe, socket file) chunk by chunk.
+
+    :param src: Readable binary file object.
+    :param dst: Writable binary file object.
+    :param table: Translation table from compile_byte_table().
+    :return: Number of bytes processed.
+    """
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        dst.write(chunk.translate(table))
+        total += len(chunk)
+
+def translate_file(input_path, output_path, table, chunk_size=CHUNK_SIZE):
+    """
+    Translates a file using memory maps: the input is mapped read-only, the output
+    file is preallocated to the same size and mapped for writing, and the data is
+    translated in large chunks with bytes.translate().
+
+    :param table: Translation table from compile_byte_table().
+    :return: Number of bytes processed.
+    """
+    size = os.path.getsize(input_path)
+    with open(input_path, 'rb') as src, open(output_path, 'w+b') as dst:
+        if size == 0:
+            return 0
+        # Preallocate the output so it can be memory-mapped
+        dst.truncate(size)
+
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as src_map, \
+             mmap.mmap(dst.fileno(), size, access=mmap.ACCESS_WRITE) as dst_map:
+            for start in range(0, size, chunk_size):
+                end = min(start + chunk_size, size)
+                dst_map[start:end] = src_map[start:end].translate(table)
+            dst_map.flush()
+    return size
+
+def encrypt_monoalphabetic_file(input_path, output_path, key, chunk_size=CHUNK_SIZE):
+    """Encrypts a file of any size with the substitution key (see translate_file)."""
+    return translate_file(input_path, output_path, compile_byte_table(key), chunk_size)
+
+def decrypt_monoalphabetic_file(input_path, output_path, key, chunk_size=CHUNK_SIZE):
+    """Decrypts a file of any size with the substitution key (see translate_file)."""
+    return translate_file(input_path, output_path, compile_byte_table(key, decrypt=True), chunk_size)
+
 def encrypt_monoalphabetic(plaintext, key):
     """
     Encrypts the plaintext using the Monoalphabetic Substitution Cipher.
@@ -23,7 +103,7 @@ def encrypt_monoalphabetic(plaintext, key):
     """
     # 1. Map the STANDARD_ALPHABET to the KEY
     # The translation table maps: A->X, B->N, C->B, etc.
-    translation_table = str.maketrans(STANDARD_ALPHABET, key)
+    translation_table = _str_translation_table(STANDARD_ALPHABET, key)
 
     # 2. Convert the plaintext to uppercase to handle all letters uniformly
     uppercase_plaintext = plaintext.upper()
@@ -46,7 +126,7 @@ def decrypt_monoalphabetic(ciphertext, key):
     # 1. Map the KEY back to the STANDARD_ALPHABET for decryption
     # The inverse translation table maps: X->A, N->B, B->C, etc.
     # The decryption map is KEY -> STANDARD_ALPHABET
-    inverse_translation_table = str.maketrans(key, STANDARD_ALPHABET)
+    inverse_translation_table = _str_translation_table(key, STANDARD_ALPHABET)
 
     # 2. Convert the ciphertext to uppercase for uniform handling
     uppercase_ciphertext = ciphertext.upper()
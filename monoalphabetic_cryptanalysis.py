@@ -0,0 +1,170 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from english_stats import letter_probabilities, ngram_log_probabilities, text_to_indices
+from monoalphabetic_cipher import STANDARD_ALPHABET, decrypt_monoalphabetic
+
+# --- Configuration ---
+NGRAM_SIZE = 4
+NGRAM_WEIGHTS = 26 ** np.arange(NGRAM_SIZE - 1, -1, -1, dtype=np.int64)
+
+# Annealing schedule: the temperature falls linearly from START_TEMPERATURE to 0.
+START_TEMPERATURE = 10.0
+ITERATIONS = 10000
+RESTARTS = 8
+
+class QuadgramScorer:
+    """
+    Precomputed quadgram data for one ciphertext, used to score decryption keys.
+
+    The ciphertext is reduced once to its distinct quadgrams and their counts. The
+    score of a key is sum(count * log10 P(decrypted quadgram)). Swapping two letters
+    of the key only changes the quadgrams that contain one of those cipher letters,
+    so swap_delta() rescores just those instead of decrypting the whole text again.
+    """
+    def __init__(self, cipher_indices, log_probs):
+        codes = np.zeros(len(cipher_indices) - NGRAM_SIZE + 1, dtype=np.int64)
+        for i in range(NGRAM_SIZE):
+            codes = codes * 26 + cipher_indices[i:len(codes) + i]
+        unique_codes, self.counts = np.unique(codes, return_counts=True)
+
+        # Letters of each distinct cipher quadgram, shape (m, 4)
+        self.quadgrams = (unique_codes[:, None] // NGRAM_WEIGHTS) % 26
+        self.log_probs = log_probs
+
+        # For every pair of cipher letters, the distinct quadgrams that contain either of them
+        contains = [np.flatnonzero((self.quadgrams == c).any(axis=1)) for c in range(26)]
+        self.affected = [[np.union1d(contains[a], contains[b]) for b in range(26)] for a in range(26)]
+
+    def plain_codes(self, key, rows=slice(None)):
+        """Codes of the decrypted quadgrams under 'key' (cipher letter -> plain letter)."""
+        return key[self.quadgrams[rows]] @ NGRAM_WEIGHTS
+
+    def score(self, key):
+        return float(self.counts @ self.log_probs[self.plain_codes(key)])
+
+    def swap_delta(self, key, codes, a, b):
+        """
+        Returns (delta, rows, new_codes) for swapping the plain letters of cipher letters a and b.
+        'codes' are the current decrypted quadgram codes for 'key'.
+        """
+        rows = self.affected[a][b]
+        key[a], key[b] = key[b], key[a]
+        new_codes = self.plain_codes(key, rows)
+        key[a], key[b] = key[b], key[a]
+        delta = self.counts[rows] @ (self.log_probs[new_codes] - self.log_probs[codes[rows]])
+        return float(delta), rows, new_codes
+
+def frequency_key(cipher_indices):
+    """Initial decryption key: the n-th most common cipher letter maps to the n-th most common English letter."""
+    cipher_order = np.argsort(-np.bincount(cipher_indices, minlength=26), kind='stable')
+    english_order = np.argsort(-letter_probabilities(), kind='stable')
+    key = np.empty(26, dtype=np.int64)
+    key[cipher_order] = english_order
+    return key
+
+def anneal(cipher_indices, seed, iterations=ITERATIONS, temperature=START_TEMPERATURE, counts_path=None):
+    """
+    One simulated-annealing run. Returns (score, key) where key maps cipher letter -> plain letter.
+    """
+    rng = random.Random(seed)
+    scorer = QuadgramScorer(cipher_indices, ngram_log_probabilities(NGRAM_SIZE, counts_path))
+
+    # Start from the frequency key, shuffled a little so each restart explores differently
+    key = frequency_key(cipher_indices)
+    for _ in range(seed % 5):
+        a, b = rng.sample(range(26), 2)
+        key[a], key[b] = key[b], key[a]
+
+    codes = scorer.plain_codes(key)
+    score = scorer.score(key)
+    best_score, best_key = score, key.copy()
+
+    for step in range(iterations):
+        t = temperature * (1 - step / iterations)
+        a, b = rng.sample(range(26), 2)
+        delta, rows, new_codes = scorer.swap_delta(key, codes, a, b)
+
+        if delta >= 0 or (t > 0 and rng.random() < math.exp(delta / t)):
+            key[a], key[b] = key[b], key[a]
+            codes[rows] = new_codes
+            score += delta
+            if score > best_score:
+                best_score, best_key = score, key.copy()
+
+    # Finish with a greedy pass: apply the best improving swap until none is left
+    key, codes, score = best_key, scorer.plain_codes(best_key), best_score
+    improved = True
+    while improved:
+        improved = False
+        best = (0.0, None)
+        for a in range(26):
+            for b in range(a + 1, 26):
+                delta, rows, new_codes = scorer.swap_delta(key, codes, a, b)
+                if delta > best[0] + 1e-9:
+                    best = (delta, (a, b, rows, new_codes))
+        if best[1] is not None:
+            a, b, rows, new_codes = best[1]
+            key[a], key[b] = key[b], key[a]
+            codes[rows] = new_codes
+            score += best[0]
+            improved = True
+
+    return score, key
+
+def _anneal_worker(args):
+    return anneal(*args)
+
+def solve_monoalphabetic(ciphertext, restarts=RESTARTS, iterations=ITERATIONS, workers=None, counts_path=None):
+    """
+    Recovers an unknown substitution key from ciphertext alone.
+
+    Independent annealing restarts run across a process pool and the best-scoring
+    key wins. counts_path optionally points to a quadgram counts file
+    (see english_stats.load_ngram_counts).
+
+    Returns (key, plaintext), where key is a 26-letter substitution alphabet
+    in the same form as DEFAULT_KEY (plain A..Z -> cipher letters).
+    """
+    cipher_indices = text_to_indices(ciphertext)
+    if len(cipher_indices) < NGRAM_SIZE:
+        raise ValueError("Ciphertext is too short to analyse.")
+
+    tasks = [(cipher_indices, seed, iterations, START_TEMPERATURE, counts_path) for seed in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    if workers == 1:
+        results = [_anneal_worker(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_anneal_worker, tasks))
+
+    _, decryption_key = max(results, key=lambda result: result[0])
+
+    # Invert cipher -> plain into the plain -> cipher alphabet used by the cipher functions
+    key = [''] * 26
+    for cipher_letter, plain_letter in enumerate(decryption_key):
+        key[plain_letter] = STANDARD_ALPHABET[cipher_letter]
+    key = ''.join(key)
+    return key, decrypt_monoalphabetic(ciphertext, key)
+
+def main():
+    """Menu-driven ciphertext-only attack."""
+    print("--- 🔓 Monoalphabetic Substitution Solver ---")
+    ciphertext = input("Enter the **ciphertext**: ")
+
+    try:
+        key, plaintext = solve_monoalphabetic(ciphertext)
+    except ValueError as e:
+        print(f"\n❌ Attack failed: {e}")
+        return
+
+    print(f"\n✅ **Recovered Key:** {key}")
+    print(f"✅ **Recovered Plaintext:** {plaintext}")
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+# Number theory shared by the CRT, RNS and RSA scripts: extended GCD, modular
+# inverses (single and batched) and the Chinese Remainder Theorem.
+# Errors are reported the same way everywhere: a missing inverse or an
+# unsolvable system raises ValueError.
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# --- Configuration ---
+# Moduli below this bound use the vectorized int64 path in CRTBasis.solve_many:
+# products of two residues then stay below 2**62.
+WORD_MODULUS_LIMIT = 2 ** 31
+
+# Number of CRTBasis objects kept for chinese_remainder_theorem()
+BASIS_CACHE_SIZE = 32
+
+# From this many congruences on, solve_general_crt() first tries the
+# product/remainder tree (coprime moduli) before merging one by one.
+TREE_THRESHOLD = 64
+
+# Operands of at least this many bits use the half-GCD in extended_gcd(); below
+# it the simple iterative loop is as fast. Also the size at which the half-GCD
+# recursion switches to plain Euclid steps.
+HALF_GCD_THRESHOLD = 1024
+
+# mod_inverse() uses the builtin pow(a, -1, m) for moduli below this many bits,
+# where it beats extended_gcd(); from here on the half-GCD is faster.
+INVERSE_HALF_GCD_THRESHOLD = 5120
+
+def extended_gcd(a, b):
+    """
+    Implements the Extended Euclidean Algorithm.
+    Returns a tuple (g, x, y) such that a*x + b*y = g = gcd(a, b).
+
+    Non-negative operands of HALF_GCD_THRESHOLD bits or more go through the
+    subquadratic half-GCD; it follows the same quotient sequence, so (g, x, y)
+    is exactly what the iterative loop would return.
+    """
+    if a > 0 and b > 0 and max(a, b).bit_length() >= HALF_GCD_THRESHOLD:
+        return extended_gcd_half(a, b)
+    return extended_gcd_iterative(a, b)
+
+def extended_gcd_iterative(a, b):
+    """
+    The Extended Euclidean Algorithm as a simple loop (no recursion limit).
+    Returns a tuple (g, x, y) such that a*x + b*y = g = gcd(a, b).
+    """
+    # Invariants: a = a0*xa + b0*ya and b = a0*xb + b0*yb
+    xa, ya, xb, yb = 1, 0, 0, 1
+    while a != 0:
+        q, r = divmod(b, a)
+        a, b = r, a
+        # Update x and y the same way the recursive form does
+        xa, ya, xb, yb = xb - q * xa, yb - q * ya, xa, ya
+
+    return (b, xb, yb)
+
+# --- Half-GCD ---
+# A run of Euclid steps (a, b) -> (b, a - q*b) is kept as its list of quotients
+# and the product M of the matrices [[q, 1], [1, 0]], so that (a, b) = M (a', b').
+# Matrices are tuples (m00, m01, m10, m11) and det(M) = (-1)^(number of quotients).
+
+_IDENTITY = (1, 0, 0, 1)
+
+def _matrix_multiply(m, n):
+    return (m[0] * n[0] + m[1] * n[2], m[0] * n[1] + m[1] * n[3],
+            m[2] * n[0] + m[3] * n[2], m[2] * n[1] + m[3] * n[3])
+
+def _matrix_solve(m, steps, a, b):
+    """(a', b') with (a, b) = M (a', b'), using M^-1 = det(M) * [[m11, -m01], [-m10, m00]]."""
+    sign = -1 if steps % 2 else 1
+    return sign * (m[3] * a - m[1] * b), sign * (m[0] * b - m[2] * a)
+
+def _euclid_steps(a, b, bits):
+    """Plain Euclid steps on a >= b > 0 while b has at least 'bits' bits. Returns (M, quotients, a', b')."""
+    m00, m01, m10, m11 = _IDENTITY
+    quotients = []
+    while b > 0 and b.bit_length() >= bits:
+        q, r = divmod(a, b)
+        a, b = b, r
+        m00, m01, m10, m11 = q * m00 + m01, m00, q * m10 + m11, m10
+        quotients.append(q)
+    return (m00, m01, m10, m11), quotients, a, b
+
+def _reduce_exactly(a, b, shift):
+    """
+    Runs the half-GCD on the top bits (a >> shift, b >> shift) and applies the
+    resulting matrix to the full a, b.
+
+    Quotients found on truncated numbers can be wrong in the last few steps, so
+    those are undone until the full pair satisfies a' > b' > 0. That condition
+    (with every quotient >= 1) means the kept quotients are exactly the first
+    quotients of the Euclidean sequence of (a, b).
+    Returns (M, quotients, a', b').
+    """
+    m, quotients, _, _ = _half_gcd(a >> shift, b >> shift)
+    a1, b1 = _matrix_solve(m, len(quotients), a, b)
+    while quotients and not a1 > b1 > 0:
+        # Undo the last quotient q: M <- M [[0, 1], [1, -q]] and (a', b') <- (q*a' + b', a')
+        q = quotients.pop()
+        m = (m[1], m[0] - q * m[1], m[3], m[2] - q * m[3])
+        a1, b1 = q * a1 + b1, a1
+    return m, quotients, a1, b1
+
+def _half_gcd(a, b):
+    """
+    Half-GCD of a >= b > 0: the first Euclid steps of (a, b), taken until the
+    remainder b' drops below about half the bit length of a.
+
+    The top half of the bits decides the first quarter of the reduction, and a
+    second recursive call on the top bits of the reduced pair decides the next,
+    so each level costs a few multiplications instead of one division per
+    quotient. Returns (M, quotients, a', b').
+    """
+    n = a.bit_length()
+    half = n // 2 + 1
+    if b.bit_length() < half:
+        return _IDENTITY, [], a, b
+    if n < HALF_GCD_THRESHOLD:
+        return _euclid_steps(a, b, half)
+
+    # 1. Top n - half bits: reduces a, b to about 3n/4 bits
+    m, quotients, a1, b1 = _reduce_exactly(a, b, half)
+    if not quotients:
+        # Very unbalanced pair (the top bits of b are all zero): one plain
+        # division step makes progress, where recursing would only shave a few bits
+        q, r = divmod(a, b)
+        m, quotients, a1, b1 = (q, 1, 1, 0), [q], b, r
+
+    # 2. Top bits of the reduced pair, chosen so the reduction lands near 'half' bits
+    if b1.bit_length() >= half:
+        shift = max(2 * half - a1.bit_length(), 0)
+        m2, quotients2, a1, b1 = _reduce_exactly(a1, b1, shift)
+        m = _matrix_multiply(m, m2)
+        quotients += quotients2
+
+    # 3. The few steps left, on numbers that are now about half size
+    m3, quotients3, a1, b1 = _euclid_steps(a1, b1, half)
+    if quotients3:
+        m = _matrix_multiply(m, m3)
+        quotients += quotients3
+    return m, quotients, a1, b1
+
+def extended_gcd_half(a, b):
+    """
+    Extended GCD of a, b > 0 with the half-GCD (Schoenhage-style, subquadratic).
+
+    The quotient sequence is exactly the one extended_gcd_iterative() follows,
+    and the coefficients are read from the product of its quotient matrices,
+    so the result (g, x, y) is identical.
+    """
+    # First step as in the iterative loop: (b, a) -> (a, b % a), quotient possibly 0
+    q, r = divmod(b, a)
+    m, steps = (q, 1, 1, 0), 1
+    big, small = a, r
+
+    while small.bit_length() >= HALF_GCD_THRESHOLD:
+        m2, quotients, big, small = _half_gcd(big, small)
+        if not quotients:
+            # Very unbalanced pair: one plain division step makes progress
+            q, r = divmod(big, small)
+            m2, quotients, big, small = (q, 1, 1, 0), [q], small, r
+        m = _matrix_multiply(m, m2)
+        steps += len(quotients)
+
+    # Small remainders: finish with plain steps
+    if small:
+        m2, quotients, big, small = _euclid_steps(big, small, 0)
+        m = _matrix_multiply(m, m2)
+        steps += len(quotients)
+
+    # (b, a) = M (g, 0), so g = det(M) * (m11 * b - m01 * a)
+    sign = -1 if steps % 2 else 1
+    return big, -sign * m[1], sign * m[3]
+
+def extended_gcd_recursive(a, b):
+    """
+    The textbook recursive form of extended_gcd(), with the same results.
+    Kept for comparison in benchmarks: it is limited by the recursion limit.
+    """
+    if a == 0:
+        return (b, 0, 1)
+
+    g, x1, y1 = extended_gcd_recursive(b % a, a)
+    return (g, y1 - (b // a) * x1, x1)
+
+def mod_inverse(a, m):
+    """
+    Finds the modular multiplicative inverse a^-1 mod m, in the range [0, m-1].
+    Raises ValueError if the inverse does not exist (gcd(a, m) != 1).
+    """
+    if m.bit_length() < INVERSE_HALF_GCD_THRESHOLD:
+        try:
+            return pow(a, -1, m)
+        except ValueError:
+            raise ValueError(f"Inverse of {a} mod {m} does not exist (a and m are not coprime)") from None
+    g, x, _ = extended_gcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"Inverse of {a} mod {m} does not exist (a and m are not coprime)")
+    return x % m
+
+def batch_inverse(values, m, missing=None):
+    """
+    Inverses of many values modulo the same m, with Montgomery's trick: one
+    modular inversion and 3*(n-1) multiplications in total.
+
+    Values with no inverse raise ValueError, or are replaced by 'missing' when
+    it is given (e.g. missing=-1).
+    """
+    values = [v % m for v in values]
+    n = len(values)
+    if n == 0:
+        return []
+
+    # 1. Prefix products: prefix[i] = values[0] * ... * values[i] (mod m)
+    prefix = [0] * n
+    running = 1
+    for i, v in enumerate(values):
+        running = running * v % m
+        prefix[i] = running
+
+    # 2. Invert the product of all values once
+    g, inv, _ = extended_gcd(running, m)
+    if g != 1:
+        invertible = [i for i, v in enumerate(values) if math.gcd(v, m) == 1]
+        if missing is None:
+            bad = next(v for v in values if math.gcd(v, m) != 1)
+            raise ValueError(f"Inverse of {bad} mod {m} does not exist (a and m are not coprime)")
+        # Invert the others and mark the rest with 'missing'
+        result = [missing] * n
+        for i, v in zip(invertible, batch_inverse([values[i] for i in invertible], m)):
+            result[i] = v
+        return result
+    inv %= m
+
+    # 3. Walk backwards. inv is (values[0] * ... * values[i])^-1, so
+    #    values[i]^-1 = inv * prefix[i-1], and dropping values[i] from inv gives the next one.
+    result = [0] * n
+    for i in range(n - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % m
+        inv = inv * values[i] % m
+    result[0] = inv
+    return result
+
+class CRTBasis:
+    """
+    A fixed set of pairwise coprime moduli, prepared for solving many systems
+    x = rem[i] (mod num[i]) with Garner's algorithm.
+
+    The constructor computes, once, the inverse of m_0 * ... * m_{i-1} mod m_i
+    for every modulus m_i: k small numbers, so the basis takes O(k) memory.
+    Solving then finds the mixed-radix digits v_i (0 <= v_i < m_i) of
+        x = v_0 + v_1*m_0 + v_2*m_0*m_1 + ...
+    using only arithmetic modulo the small m_i, with no division of the full product M.
+    Each digit costs O(i) small steps, so for one-off solves of many congruences
+    solve_general_crt() (product/remainder tree) is faster.
+    """
+    def __init__(self, moduli):
+        self.moduli = [int(n) for n in moduli]
+        if not self.moduli:
+            raise ValueError("At least one modulus is required.")
+        if any(n <= 0 for n in self.moduli):
+            raise ValueError("Moduli must be positive.")
+
+        self.modulus = 1
+        self._prefix_inverse = []
+        for n_i in self.moduli:
+            # self.modulus is m_0 * ... * m_{i-1} here; raises ValueError if
+            # n_i shares a factor with an earlier modulus
+            self._prefix_inverse.append(mod_inverse(self.modulus % n_i, n_i))
+            self.modulus *= n_i
+
+        # The vectorized path is only used when every modulus fits in a word
+        self._word_sized = max(self.moduli) < WORD_MODULUS_LIMIT
+        if self._word_sized:
+            self._np_moduli = np.array(self.moduli, dtype=np.int64)
+
+    def mixed_radix(self, rem):
+        """Garner's mixed-radix digits [v_0, ..., v_{k-1}] of the solution."""
+        if len(rem) != len(self.moduli):
+            raise ValueError("Number of remainders does not match the number of moduli.")
+        digits = []
+        for i, (n_i, r_i, inverse) in enumerate(zip(self.moduli, rem, self._prefix_inverse)):
+            # v_i = (r_i - (v_0 + v_1*m_0 + ...)) / (m_0 * ... * m_{i-1})  (mod m_i),
+            # with the partial sum evaluated by Horner's rule from v_{i-1} down, mod m_i
+            partial = 0
+            for j in range(i - 1, -1, -1):
+                partial = (partial * self.moduli[j] + digits[j]) % n_i
+            digits.append((r_i - partial) * inverse % n_i)
+        return digits
+
+    def solve(self, rem):
+        """The smallest non-negative x with x = rem[i] (mod num[i]) for all i."""
+        # Horner evaluation of the mixed-radix form, from the last digit down
+        result = 0
+        for n_i, v_i in zip(reversed(self.moduli), reversed(self.mixed_radix(rem))):
+            result = result * n_i + v_i
+        return result
+
+    def solve_many(self, rems):
+        """
+        Solves many systems at once. 'rems' has shape (count, k), one row of
+        remainders per system. Returns an int64 array when M fits in 63 bits,
+        otherwise an object array of Python ints.
+        """
+        rems = np.asarray(rems)
+        if rems.ndim != 2 or rems.shape[1] != len(self.moduli):
+            raise ValueError("Remainders must have shape (count, number of moduli).")
+
+        if not self._word_sized:
+            # Large moduli: Python ints, one system at a time
+            result = np.empty(len(rems), dtype=object)
+            for index, row in enumerate(rems.tolist()):
+                result[index] = self.solve(row)
+            return result
+
+        rems = (rems % self._np_moduli).astype(np.int64)
+
+        # Mixed-radix digits, one column per modulus, all systems at once.
+        # Residues are below 2**31, so partial * m_j + v_j stays below 2**62.
+        digits = np.empty_like(rems)
+        for i, n_i in enumerate(self.moduli):
+            partial = np.zeros(len(rems), dtype=np.int64)
+            for j in range(i - 1, -1, -1):
+                partial = (partial * self.moduli[j] + digits[:, j]) % n_i
+            digits[:, i] = (rems[:, i] - partial) % n_i * self._prefix_inverse[i] % n_i
+
+        # Horner evaluation, column by column
+        big = self.modulus >= 2 ** 63
+        result = np.zeros(len(rems), dtype=object if big else np.int64)
+        for i in range(len(self.moduli) - 1, -1, -1):
+            column = digits[:, i].astype(object) if big else digits[:, i]
+            result = result * self.moduli[i] + column
+        return result
+
+@lru_cache(maxsize=BASIS_CACHE_SIZE)
+def crt_basis(num):
+    """
+    Cached CRTBasis for a tuple of moduli, for callers that solve many systems
+    against the same moduli. One-off solves should use chinese_remainder_theorem().
+    """
+    return CRTBasis(num)
+
+def chinese_remainder_theorem(num, rem):
+    """
+    Solves the system of congruences:
+    x = rem[i] (mod num[i])
+    where num[i] are the moduli and rem[i] are the remainders.
+    A one-off solve: goes through solve_general_crt(), which uses the product/remainder
+    tree for many congruences, and builds no basis. Raises ValueError if there is no solution.
+    """
+    return solve_general_crt(list(num), list(rem))[0]
+
+def merge_congruences(r1, n1, r2, n2):
+    """
+    Merges x = r1 (mod n1) and x = r2 (mod n2) into a single x = r (mod lcm(n1, n2)).
+    The moduli need not be coprime. Returns (r, lcm), or None if no x satisfies both.
+    """
+    # n1*p + n2*q = g
+    g, p, _ = extended_gcd(n1, n2)
+    difference = r2 - r1
+    if difference % g != 0:
+        return None
+
+    lcm = n1 // g * n2
+    # x = r1 + n1*t where n1*t = r2 - r1 (mod n2), i.e. t = (difference / g) * p (mod n2 / g)
+    t = difference // g * p % (n2 // g)
+    return (r1 + n1 * t) % lcm, lcm
+
+def _raise_conflict(num, rem, first, j):
+    """
+    Raises the ValueError for a system in which congruences first..j-1 are
+    consistent and adding congruence j is not.
+    """
+    # A system is solvable exactly when every pair of its congruences is. The
+    # congruences before j are, so the conflicting pair must include j: O(k) checks.
+    i = next(i for i in range(first, j) if (rem[j] - rem[i]) % math.gcd(num[i], num[j]) != 0)
+    raise ValueError(
+        f"No solution: x = {rem[i]} (mod {num[i]}) and x = {rem[j]} (mod {num[j]}) are inconsistent.")
+
+def _merge_range(num, rem, first, start, stop, r, n):
+    """
+    Merges congruences start..stop-1 one at a time into x = r (mod n), the
+    merge of congruences first..start-1. Returns the merged (r, n).
+    """
+    for j in range(start, stop):
+        merged = merge_congruences(r, n, rem[j], num[j])
+        if merged is None:
+            _raise_conflict(num, rem, first, j)
+        r, n = merged
+    return r, n
+
+def _merge_tree(num, rem):
+    """
+    Merges congruences pairwise, level by level like a product tree, for any
+    positive moduli. Each merge joins two moduli of similar size, so the big-number
+    work stays quasi-linear instead of quadratic as when merging one at a time.
+
+    Nodes are (r, n, start, stop) for congruences start..stop-1. If two nodes do
+    not merge, the right one is merged into the left one congruence by congruence
+    to find the conflict. Returns (x, lcm).
+    """
+    nodes = [(r % n, n, i, i + 1) for i, (n, r) in enumerate(zip(num, rem))]
+    while len(nodes) > 1:
+        merged = []
+        for (r1, n1, start, middle), (r2, n2, _, stop) in zip(nodes[0::2], nodes[1::2]):
+            node = merge_congruences(r1, n1, r2, n2)
+            if node is None:
+                node = _merge_range(num, rem, start, middle, stop, r1, n1)
+            merged.append((*node, start, stop))
+        if len(nodes) % 2:
+            merged.append(nodes[-1])
+        nodes = merged
+    return nodes[0][:2]
+
+def product_tree(values):
+    """Levels of a product tree: [values, pairwise products, ..., [product of all]]."""
+    levels = [list(values)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+def _tree_crt(num, rem):
+    """
+    CRT with a product tree and a remainder tree (for pairwise coprime moduli).
+
+    1. Product tree of the moduli, M at the root.
+    2. Remainder tree: reducing M modulo the squares of the node products on the
+       way down gives M mod n_i^2 at the leaves, and (M mod n_i^2) / n_i = (M / n_i) mod n_i.
+    3. Only those small values are inverted, modulo the small n_i.
+    4. The terms (r_i * c_i mod n_i) * M / n_i are combined back up the tree by
+       multiplying with the sibling products, so M is never divided by n_i.
+    Returns (x, M), or None if some modulus shares a factor with the others.
+    """
+    levels = product_tree(num)
+    modulus = levels[-1][0]
+
+    # 2. Remainder tree, from the root down to the leaves
+    remainders = [modulus]
+    for level in reversed(levels[:-1]):
+        remainders = [remainders[i // 2] % (node * node) for i, node in enumerate(level)]
+
+    # 3. Leaf coefficients c_i = (M / n_i)^-1 mod n_i
+    values = []
+    for n_i, r_i, m_i in zip(num, rem, remainders):
+        cofactor = m_i // n_i
+        if math.gcd(cofactor, n_i) != 1:
+            return None
+        values.append(r_i * pow(cofactor, -1, n_i) % n_i)
+
+    # 4. Linear combination tree: node value = left * product(right) + right * product(left)
+    for level in levels[:-1]:
+        combined = [values[i] * level[i + 1] + values[i + 1] * level[i] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            combined.append(values[-1])
+        values = combined
+
+    return values[0] % modulus, modulus
+
+def solve_general_crt(num, rem):
+    """
+    Solves x = rem[i] (mod num[i]) for any positive moduli, coprime or not.
+
+    For many congruences the product/remainder tree is tried first: it only
+    multiplies big numbers and inverts small ones, so it costs about as much as
+    a few multiplications of the full product. If the moduli turn out not to be
+    coprime, the congruences are merged pairwise in a tree instead, which is
+    still quasi-linear. Few congruences are merged one at a time.
+
+    Returns (x, L) with 0 <= x < L = lcm(num). Raises ValueError naming two
+    conflicting congruences if the system has no solution.
+    """
+    if len(num) != len(rem):
+        raise ValueError("Number of remainders does not match the number of moduli.")
+    if not num:
+        raise ValueError("At least one congruence is required.")
+    if any(n <= 0 for n in num):
+        raise ValueError("Moduli must be positive.")
+    num, rem = list(num), list(rem)
+
+    if len(num) >= TREE_THRESHOLD:
+        return _tree_crt(num, rem) or _merge_tree(num, rem)
+    return _merge_range(num, rem, 0, 1, len(num), rem[0] % num[0], num[0])
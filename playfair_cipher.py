@@ -1,8 +1,20 @@
 import string
+from functools import lru_cache
+
+import numpy as np
+
+from english_stats import text_to_indices as letter_indices
 
 # --- Configuration ---
 KEY_SQUARE_SIZE = 5
 STANDARD_ALPHABET = string.ascii_uppercase.replace('J', '') # Use I/J rule
+ALPHABET_SIZE = KEY_SQUARE_SIZE * KEY_SQUARE_SIZE
+
+# Lookup tables: A..Z letter index -> index in STANDARD_ALPHABET (J -> I),
+# and letter index -> ASCII byte.
+_FROM_STANDARD = np.array([STANDARD_ALPHABET.index('I' if c == 'J' else c) for c in string.ascii_uppercase],
+                          dtype=np.uint8)
+_INDEX_TO_BYTE = np.frombuffer(STANDARD_ALPHABET.encode('ascii'), dtype=np.uint8)
 
 def create_key_square(key):
     """
@@ -52,57 +64,202 @@ def preprocess_plaintext(plaintext):
     4. Inserts filler ('X') if two adjacent letters are the same.
     5. Appends filler ('X') if the total length is odd.
     """
-    
-    # 1, 2, 3: Clean and standardize
-    text = plaintext.upper()
-    text = ''.join(c for c in text if 'A' <= c <= 'Z')
-    text = text.replace('J', 'I')
-    
-    # 4. Insert filler 'X' for double letters
-    i = 0
-    while i < len(text) - 1:
-        if text[i] == text[i+1]:
-            text = text[:i+1] + 'X' + text[i+1:]
-        i += 2
-        
-    # 5. Append filler 'X' if length is odd
-    if len(text) % 2 != 0:
-        text += 'X'
-        
+    pairs = preprocess_indices(plaintext)
+    text = indices_to_text(pairs)
     return [text[i:i+2] for i in range(0, len(text), 2)] # Return list of digraphs
 
+def preprocess_indices(plaintext):
+    """
+    Same as preprocess_plaintext(), but returns the digraphs as an (n, 2) array of
+    letter indices that can be passed straight to playfair_process().
+    """
+    preprocessor = PlayfairPreprocessor()
+    pairs = preprocessor.feed(plaintext)
+    return np.concatenate([pairs, preprocessor.finish()])
+
+class PlayfairPreprocessor:
+    """
+    Single-pass, chunked Playfair preprocessing.
+
+    feed() takes the next chunk of plaintext and returns the complete digraphs
+    it produced as an (n, 2) array of letter indices. A letter that starts a
+    pair but has no partner yet is carried to the next chunk, so the digraphs
+    are the same as for one-shot processing and memory stays constant.
+    finish() pads the last carried letter with the filler.
+
+    A filler goes after letter i when letter i starts a digraph and equals
+    letter i + 1. Inserting it shifts the pairing by one letter, so only the
+    doubled positions are walked in Python. All other work is array operations,
+    which makes the whole pass O(n).
+    """
+    def __init__(self, filler='X'):
+        self.filler = STANDARD_ALPHABET.index(filler)
+        self._pending = np.empty(0, dtype=np.uint8)
+
+    def feed(self, chunk):
+        letters = text_to_indices(chunk)
+        if len(self._pending):
+            letters = np.concatenate([self._pending, letters])
+
+        # 1. Find the doubled letters that actually start a digraph (position 0 always starts one)
+        doubles = np.flatnonzero(letters[:-1] == letters[1:])
+        fillers = []
+        parity = 0
+        for j in doubles.tolist():
+            if j % 2 == parity:
+                fillers.append(j + 1)
+                parity ^= 1
+
+        # 2. Insert all fillers at once, then cut into pairs and carry an odd letter
+        if fillers:
+            letters = np.insert(letters, fillers, self.filler)
+        usable = len(letters) - len(letters) % 2
+        self._pending = letters[usable:].copy()
+        return letters[:usable].reshape(-1, 2)
+
+    def finish(self):
+        """Returns the final digraph (padded with the filler), if a letter is still pending."""
+        if len(self._pending) == 0:
+            return np.empty((0, 2), dtype=np.uint8)
+        last = np.array([[self._pending[0], self.filler]], dtype=np.uint8)
+        self._pending = np.empty(0, dtype=np.uint8)
+        return last
+
+def playfair_stream(chunks, key, mode='encrypt'):
+    """
+    Encrypts or decrypts an iterable of text chunks with constant memory, yielding
+    the output for each chunk. Plaintext is preprocessed on the fly; for decryption
+    an odd letter at the end of a chunk is carried to the next one.
+
+    key may be a key phrase or a compiled PlayfairKey.
+    """
+    if not isinstance(key, PlayfairKey):
+        key = PlayfairKey(key)
+
+    if mode == 'encrypt':
+        preprocessor = PlayfairPreprocessor()
+        for chunk in chunks:
+            pairs = preprocessor.feed(chunk)
+            if len(pairs):
+                yield playfair_process(pairs, key, mode)
+        pairs = preprocessor.finish()
+        if len(pairs):
+            yield playfair_process(pairs, key, mode)
+        return
+
+    pending = np.empty(0, dtype=np.uint8)
+    for chunk in chunks:
+        letters = np.concatenate([pending, text_to_indices(chunk)])
+        usable = len(letters) - len(letters) % 2
+        pending = letters[usable:]
+        if usable:
+            yield playfair_process(letters[:usable], key, mode)
+    if len(pending):
+        raise ValueError("Ciphertext length is odd. Cannot decrypt.")
+
 def playfair_process(digraphs, key_square, mode='encrypt'):
     """
     Performs the core Playfair substitution (encryption or decryption).
+    key_square may be a 5x5 key square or a compiled PlayfairKey; digraphs may be
+    a list of 2-character strings or an (n, 2) array of letter indices.
     """
-    processed_text = []
-    
-    # Determine the shift direction (+1 for encrypt, -1 for decrypt)
-    shift = 1 if mode == 'encrypt' else -1
+    if isinstance(key_square, PlayfairKey):
+        key = key_square
+    else:
+        key = _compile_square(tuple(tuple(row) for row in key_square))
+
+    # Every digraph is a single lookup in the precomputed table
+    return indices_to_text(key.map_digraphs(digraphs_to_indices(digraphs), mode))
+
+def text_to_indices(text):
+    """Converts text to a uint8 array of letter indices (I/J rule applied, non-letters dropped)."""
+    return _FROM_STANDARD[letter_indices(text, dtype=np.uint8)]
+
+def indices_to_text(indices):
+    """Converts an array of letter indices back to an uppercase string."""
+    return _INDEX_TO_BYTE[np.asarray(indices, dtype=np.uint8).ravel()].tobytes().decode('ascii')
+
+def digraphs_to_indices(digraphs):
+    """
+    Converts digraphs to an (n, 2) array of letter indices. Accepts a list of
+    2-character strings (as returned by preprocess_plaintext) or an index array.
+    """
+    if isinstance(digraphs, np.ndarray):
+        return digraphs.reshape(-1, 2)
+    return text_to_indices(''.join(digraphs)).reshape(-1, 2)
+
+class PlayfairKey:
+    """
+    A compiled Playfair key.
+
+    The full 25 x 25 encryption and decryption digraph tables are computed once
+    per key: table[a, b] holds the output letter pair for the input pair (a, b).
+    A whole text is then mapped with a single NumPy indexing operation, with no
+    per-digraph search of the key square.
+    """
+    def __init__(self, key):
+        self._compile(create_key_square(key))
 
-    for L1, L2 in digraphs:
-        r1, c1 = find_position(key_square, L1)
-        r2, c2 = find_position(key_square, L2)
+    @classmethod
+    def from_square(cls, key_square):
+        """Compiles an existing 5x5 key square (list of lists of letters)."""
+        compiled = cls.__new__(cls)
+        compiled._compile(key_square)
+        return compiled
 
+    def _compile(self, key_square):
+        self.key_square = [list(row) for row in key_square]
+        
+        # Square as letter indices, and the row/column of every letter index
+        square = text_to_indices(''.join(''.join(row) for row in self.key_square)).reshape(KEY_SQUARE_SIZE, KEY_SQUARE_SIZE)
+        position = np.empty(ALPHABET_SIZE, dtype=np.int64)
+        position[square.ravel()] = np.arange(ALPHABET_SIZE)
+        row, col = position // KEY_SQUARE_SIZE, position % KEY_SQUARE_SIZE
+
+        self.encrypt_table = self._build_table(square, row, col, 1)
+        self.decrypt_table = self._build_table(square, row, col, -1)
+
+    @staticmethod
+    def _build_table(square, row, col, shift):
+        """Applies the three Playfair rules to all 625 letter pairs at once."""
+        r1, r2 = row[:, None], row[None, :]
+        c1, c2 = col[:, None], col[None, :]
+        r1, r2, c1, c2 = np.broadcast_arrays(r1, r2, c1, c2)
+        same_row = r1 == r2
+        same_col = (c1 == c2) & ~same_row
+        
+        # Rule 3: Rectangle (swap column indices)
+        new_r1, new_c1, new_r2, new_c2 = r1.copy(), c2.copy(), r2.copy(), c1.copy()
         # Rule 1: Same Row
-        if r1 == r2:
-            new_L1 = key_square[r1][(c1 + shift) % KEY_SQUARE_SIZE]
-            new_L2 = key_square[r2][(c2 + shift) % KEY_SQUARE_SIZE]
-            
+        new_c1[same_row] = (c1[same_row] + shift) % KEY_SQUARE_SIZE
+        new_c2[same_row] = (c2[same_row] + shift) % KEY_SQUARE_SIZE
         # Rule 2: Same Column
-        elif c1 == c2:
-            new_L1 = key_square[(r1 + shift) % KEY_SQUARE_SIZE][c1]
-            new_L2 = key_square[(r2 + shift) % KEY_SQUARE_SIZE][c2]
-            
-        # Rule 3: Rectangle
-        else:
-            # Swap column indices
-            new_L1 = key_square[r1][c2]
-            new_L2 = key_square[r2][c1]
-        
-        processed_text.append(new_L1 + new_L2)
+        new_r1[same_col] = (r1[same_col] + shift) % KEY_SQUARE_SIZE
+        new_r2[same_col] = (r2[same_col] + shift) % KEY_SQUARE_SIZE
+        new_c1[same_col], new_c2[same_col] = c1[same_col], c2[same_col]
+
+        return np.stack([square[new_r1, new_c1], square[new_r2, new_c2]], axis=-1).astype(np.uint8)
+
+    def map_digraphs(self, pairs, mode='encrypt'):
+        """Maps an (n, 2) array of letter index pairs through the encrypt or decrypt table."""
+        table = self.encrypt_table if mode == 'encrypt' else self.decrypt_table
+        pairs = np.asarray(pairs)
+        return table[pairs[:, 0], pairs[:, 1]]
+
+    def encrypt(self, plaintext):
+        """Preprocesses and encrypts a message."""
+        return playfair_process(preprocess_indices(plaintext), self, mode='encrypt')
+
+    def decrypt(self, ciphertext):
+        """Decrypts a message (the cleaned ciphertext must have an even length)."""
+        indices = text_to_indices(ciphertext)
+        if len(indices) % 2 != 0:
+            raise ValueError("Ciphertext length is odd. Cannot decrypt.")
+        return indices_to_text(self.map_digraphs(indices.reshape(-1, 2), mode='decrypt'))
 
-    return "".join(processed_text)
+@lru_cache(maxsize=32)
+def _compile_square(square):
+    return PlayfairKey.from_square(square)
 
 def main():
     """Main menu-driven program loop."""
@@ -115,7 +272,8 @@ def main():
             break
         print("Key cannot be empty.")
         
-    key_square = create_key_square(key)
+    playfair_key = PlayfairKey(key)
+    key_square = playfair_key.key_square
     
     print("\n**Generated 5x5 Key Square:**")
     # Display the key square nicely
@@ -137,7 +295,7 @@ def main():
             # --- ENCRYPTION ---
             plaintext = input("Enter the message to **encrypt**: ")
             digraphs = preprocess_plaintext(plaintext)
-            ciphertext = playfair_process(digraphs, key_square, mode='encrypt')
+            ciphertext = playfair_process(digraphs, playfair_key, mode='encrypt')
             
             print(f"\n   **Preprocessed Digraphs:** {' '.join(digraphs)}")
             print(f"✅ **Ciphertext:** {ciphertext}")
@@ -157,7 +315,7 @@ def main():
                  
             digraphs = [cleaned_ciphertext[i:i+2] for i in range(0, len(cleaned_ciphertext), 2)]
             
-            decrypted_text = playfair_process(digraphs, key_square, mode='decrypt')
+            decrypted_text = playfair_process(digraphs, playfair_key, mode='decrypt')
             
             print(f"\n✅ **Decrypted Plaintext:** {decrypted_text}")
             
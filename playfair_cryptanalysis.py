@@ -0,0 +1,321 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from english_stats import interpolated_log_probabilities
+from playfair_cipher import (
+    ALPHABET_SIZE,
+    KEY_SQUARE_SIZE,
+    STANDARD_ALPHABET,
+    PlayfairKey,
+    indices_to_text,
+    text_to_indices,
+)
+
+# --- Configuration ---
+NGRAM_SIZE = 4
+NGRAM_WEIGHTS = 26 ** np.arange(NGRAM_SIZE - 1, -1, -1, dtype=np.int64)
+
+# Playfair letter index (25 letters, no J) -> index in A..Z, for n-gram lookups
+PLAYFAIR_TO_STANDARD = np.array([ord(c) - ord('A') for c in STANDARD_ALPHABET], dtype=np.int64)
+
+# Annealing schedule: the temperature falls linearly to 0 from a start value that
+# grows with the ciphertext length (score differences grow with it too).
+TEMPERATURE_PER_LETTER = 0.015
+ITERATIONS = 300000
+
+# Restarts run in waves of one per worker. A run that finds the key usually lands on
+# exactly the same decryption as any other run that finds it, so the search stops as
+# soon as two restarts agree on the best one.
+RESTARTS = 8
+AGREEING_RESTARTS = 2
+
+# Largest number of candidate squares proposed and scored together in one batch.
+MAX_PROPOSAL_BATCH = 64
+
+# Known-key check: English text that is not part of english_stats.SAMPLE_TEXT.
+CHECK_KEY = 'MONARCHY'
+CHECK_PLAINTEXT = (
+    "When the bridge over the river was finally finished, the whole town came out to "
+    "watch the first train cross it. Children sat on the shoulders of their parents, and "
+    "the school band played the only three songs it knew. The engineer who had designed "
+    "the bridge stood a little apart from the crowd with his hands in his pockets. For "
+    "four years he had worried about the winter floods, the soft clay under the northern "
+    "pier and the price of every ton of steel. Now the train rolled slowly onto the first "
+    "span, the rails began to hum, and nothing moved except the smoke drifting away over "
+    "the water. Only then did he allow himself to smile."
+)
+
+def _square_mutations():
+    """
+    Every mutation of the square, expressed as a permutation of the 25 positions:
+    swapping two letters, swapping two rows, swapping two columns, transposing the
+    square, and reversing the row order, the column order, or the whole square.
+    Returns (permutations, weights) where weights favour single letter swaps.
+    """
+    grid = np.arange(ALPHABET_SIZE).reshape(KEY_SQUARE_SIZE, KEY_SQUARE_SIZE)
+    letter_swaps, structural = [], []
+
+    for a in range(ALPHABET_SIZE):
+        for b in range(a + 1, ALPHABET_SIZE):
+            perm = np.arange(ALPHABET_SIZE)
+            perm[a], perm[b] = b, a
+            letter_swaps.append(perm)
+
+    for a in range(KEY_SQUARE_SIZE):
+        for b in range(a + 1, KEY_SQUARE_SIZE):
+            rows = grid.copy()
+            rows[[a, b]] = rows[[b, a]]
+            cols = grid.copy()
+            cols[:, [a, b]] = cols[:, [b, a]]
+            structural += [rows.ravel(), cols.ravel()]
+    structural += [grid.T.ravel(), grid[::-1].ravel(), grid[:, ::-1].ravel(), grid[::-1, ::-1].ravel()]
+
+    perms = np.array(letter_swaps + structural)
+    # About 90% letter swaps, 10% structural changes
+    weights = np.concatenate([np.full(len(letter_swaps), 0.9 / len(letter_swaps)),
+                              np.full(len(structural), 0.1 / len(structural))])
+    return perms, weights
+
+MUTATIONS, MUTATION_WEIGHTS = _square_mutations()
+
+def _decrypt_positions():
+    """
+    The Playfair rules only depend on where the two letters sit in the square, not on
+    which letters they are. This table maps every pair of square positions
+    (p1 * 25 + p2) to the pair of positions holding the decrypted letters.
+    """
+    p1, p2 = np.divmod(np.arange(ALPHABET_SIZE * ALPHABET_SIZE), ALPHABET_SIZE)
+    r1, c1 = np.divmod(p1, KEY_SQUARE_SIZE)
+    r2, c2 = np.divmod(p2, KEY_SQUARE_SIZE)
+    same_row = r1 == r2
+    same_col = (c1 == c2) & ~same_row
+
+    # Rule 3 (rectangle) by default, then the same-row and same-column rules (shift -1)
+    new_c1 = np.where(same_row, (c1 - 1) % KEY_SQUARE_SIZE, np.where(same_col, c1, c2))
+    new_c2 = np.where(same_row, (c2 - 1) % KEY_SQUARE_SIZE, np.where(same_col, c2, c1))
+    new_r1 = np.where(same_col, (r1 - 1) % KEY_SQUARE_SIZE, r1)
+    new_r2 = np.where(same_col, (r2 - 1) % KEY_SQUARE_SIZE, r2)
+    return np.stack([new_r1 * KEY_SQUARE_SIZE + new_c1, new_r2 * KEY_SQUARE_SIZE + new_c2], axis=-1)
+
+DECRYPT_POSITIONS = _decrypt_positions()
+DECRYPT_FIRST = np.ascontiguousarray(DECRYPT_POSITIONS[:, 0])
+DECRYPT_SECOND = np.ascontiguousarray(DECRYPT_POSITIONS[:, 1])
+
+def _playfair_quadgram_table(log_probs):
+    """
+    Re-indexes a table of 26**4 quadgram log-probabilities by Playfair letter indices,
+    so a quadgram code is simply a base-25 number built from decrypted letters.
+    """
+    letters = np.indices((ALPHABET_SIZE,) * NGRAM_SIZE).reshape(NGRAM_SIZE, -1)
+    return log_probs[NGRAM_WEIGHTS @ PLAYFAIR_TO_STANDARD[letters]]
+
+class DigraphScorer:
+    """
+    Scores candidate key squares against one ciphertext without building strings.
+
+    Candidate squares are arrays of 25 letter indices. For a whole batch of them,
+    every cipher digraph is decrypted with a single lookup in DECRYPT_POSITIONS,
+    and the plaintext is scored with quadgram log-probabilities.
+    """
+    def __init__(self, cipher_pairs, log_probs):
+        self.first = cipher_pairs[:, 0].astype(np.int64)
+        self.second = cipher_pairs[:, 1].astype(np.int64)
+        self.log_probs = _playfair_quadgram_table(log_probs)
+
+    def decrypt_pairs(self, squares):
+        """First and second plaintext letters of every digraph, each of shape (batch, n_pairs)."""
+        squares = np.asarray(squares, dtype=np.int64)
+        batch = len(squares)
+        position = np.empty_like(squares)
+        position[np.arange(batch)[:, None], squares] = np.arange(ALPHABET_SIZE)
+
+        # Square positions of each cipher digraph -> square positions of its plaintext
+        pair_codes = position[:, self.first] * ALPHABET_SIZE + position[:, self.second]
+        offsets = (np.arange(batch) * ALPHABET_SIZE)[:, None]
+        flat_squares = squares.ravel()
+        return (flat_squares.take(offsets + DECRYPT_FIRST.take(pair_codes)),
+                flat_squares.take(offsets + DECRYPT_SECOND.take(pair_codes)))
+
+    def decrypt(self, squares):
+        """Plaintext letter indices for a batch of squares, shape (batch, n)."""
+        first, second = self.decrypt_pairs(squares)
+        return np.stack([first, second], axis=-1).reshape(len(first), -1)
+
+    def score(self, squares):
+        """
+        Quadgram log-probability of the decryption under each square, shape (batch,).
+
+        Quadgrams starting on a digraph are two whole plaintext digraphs; the ones in
+        between are the second letter of one digraph, the next digraph and the first
+        letter of the digraph after that.
+        """
+        first, second = self.decrypt_pairs(squares)
+        digraphs = first * ALPHABET_SIZE + second
+        aligned = self.log_probs.take(digraphs[:, :-1] * ALPHABET_SIZE ** 2 + digraphs[:, 1:])
+        straddling = self.log_probs.take(
+            (second[:, :-2] * ALPHABET_SIZE ** 2 + digraphs[:, 1:-1]) * ALPHABET_SIZE + first[:, 2:])
+        return aligned.sum(axis=1) + straddling.sum(axis=1)
+
+def start_temperature(n_letters):
+    """Initial annealing temperature for a ciphertext of n_letters."""
+    return TEMPERATURE_PER_LETTER * n_letters
+
+def anneal(cipher_pairs, seed, iterations=ITERATIONS, temperature=None, counts_path=None):
+    """
+    One simulated-annealing run from a random square.
+
+    Proposals are generated and scored in batches; they are then considered in
+    order and the first one accepted becomes the new square. Rejected proposals
+    leave the square unchanged, so this is exactly sequential annealing with the
+    scoring vectorized. The batch size follows the recent acceptance rate, so
+    little work is thrown away while the temperature is still high.
+
+    Returns (score, square) where square is an array of 25 letter indices (row by row).
+    """
+    rng = np.random.default_rng(seed)
+    scorer = DigraphScorer(cipher_pairs, interpolated_log_probabilities(NGRAM_SIZE, counts_path))
+    temperature = temperature or start_temperature(cipher_pairs.size)
+
+    square = rng.permutation(ALPHABET_SIZE)
+    score = float(scorer.score(square[None, :])[0])
+    best_score, best_square = score, square.copy()
+
+    step = 0
+    acceptance_rate = 1.0
+    while step < iterations:
+        t = temperature * (1 - step / iterations)
+        batch = int(min(MAX_PROPOSAL_BATCH, max(1, 2 / acceptance_rate)))
+        proposals = square[MUTATIONS[rng.choice(len(MUTATIONS), batch, p=MUTATION_WEIGHTS)]]
+        deltas = scorer.score(proposals) - score
+
+        accept_probability = np.exp(np.minimum(deltas, 0) / t) if t > 0 else (deltas >= 0).astype(float)
+        accepted = np.flatnonzero(rng.random(batch) < accept_probability)
+
+        if len(accepted):
+            first = int(accepted[0])
+            square = proposals[first]
+            score += float(deltas[first])
+            step += first + 1
+            acceptance_rate = 0.9 * acceptance_rate + 0.1 / (first + 1)
+            if score > best_score:
+                best_score, best_square = score, square.copy()
+        else:
+            step += batch
+            acceptance_rate = 0.9 * acceptance_rate + 0.1 * 0.5 / batch
+
+    return best_score, best_square
+
+def _anneal_worker(args):
+    return anneal(*args)
+
+def _run_restarts(tasks, workers, scorer, pool=None):
+    """
+    Runs the annealing tasks in waves of 'workers' until AGREEING_RESTARTS of them
+    reach the best decryption found so far. Returns the best square.
+    """
+    squares = []
+    for start in range(0, len(tasks), workers):
+        wave = tasks[start:start + workers]
+        results = pool.map(_anneal_worker, wave) if pool else map(_anneal_worker, wave)
+        squares += [square for _, square in results]
+
+        # Rescore from scratch: the running scores of the runs carry rounding drift
+        plaintexts = scorer.decrypt(squares)
+        best = int(np.argmax(scorer.score(squares)))
+        if (plaintexts == plaintexts[best]).all(axis=1).sum() >= AGREEING_RESTARTS:
+            break
+    return squares[best]
+
+def solve_playfair(ciphertext, restarts=RESTARTS, iterations=ITERATIONS, workers=None, counts_path=None):
+    """
+    Recovers an unknown Playfair key square from ciphertext alone.
+
+    Independent annealing restarts run across a process pool and the best-scoring
+    square wins; the remaining restarts are skipped once two of them agree.
+    counts_path optionally points to a quadgram counts file
+    (see english_stats.load_ngram_counts).
+
+    Returns (key_square, plaintext), with key_square in the same 5x5 list form
+    as create_key_square().
+    """
+    letters = text_to_indices(ciphertext)
+    if len(letters) % 2 != 0:
+        raise ValueError("Ciphertext length is odd. Cannot decrypt.")
+    if len(letters) < NGRAM_SIZE:
+        raise ValueError("Ciphertext is too short to analyse.")
+    cipher_pairs = letters.reshape(-1, 2)
+
+    tasks = [(cipher_pairs, seed, iterations, None, counts_path) for seed in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    scorer = DigraphScorer(cipher_pairs, interpolated_log_probabilities(NGRAM_SIZE, counts_path))
+    if workers == 1:
+        square = _run_restarts(tasks, workers, scorer)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            square = _run_restarts(tasks, workers, scorer, pool)
+
+    square_text = indices_to_text(square)
+    key_square = [list(square_text[i * KEY_SQUARE_SIZE:(i + 1) * KEY_SQUARE_SIZE]) for i in range(KEY_SQUARE_SIZE)]
+    key = PlayfairKey.from_square(key_square)
+    return key_square, indices_to_text(key.map_digraphs(cipher_pairs, mode='decrypt'))
+
+def check_known_key(key=CHECK_KEY, plaintext=CHECK_PLAINTEXT, workers=None):
+    """
+    Regression check for the solver: encrypts 'plaintext' under 'key', attacks the
+    ciphertext and compares the result with the true decryption. Any square that
+    decrypts identically counts (rotating its rows or columns gives the same cipher).
+
+    Returns (passed, seconds).
+    """
+    playfair_key = PlayfairKey(key)
+    ciphertext = playfair_key.encrypt(plaintext)
+
+    start = time.perf_counter()
+    _, recovered = solve_playfair(ciphertext, workers=workers)
+    return recovered == playfair_key.decrypt(ciphertext), time.perf_counter() - start
+
+def main():
+    """Menu-driven ciphertext-only attack."""
+    print("--- 🔓 Playfair Key-Square Solver ---")
+
+    while True:
+        print("\n--- Menu ---")
+        print("1. **Solve** a ciphertext")
+        print(f"2. **Check** the solver against the known key {CHECK_KEY}")
+        print("3. **Exit**")
+
+        choice = input("Enter your choice (1, 2, or 3): ").strip()
+
+        if choice == '1':
+            ciphertext = input("Enter the **ciphertext**: ")
+            try:
+                key_square, plaintext = solve_playfair(ciphertext)
+            except ValueError as e:
+                print(f"\n❌ Attack failed: {e}")
+                continue
+
+            print("\n✅ **Recovered 5x5 Key Square:**")
+            for row in key_square:
+                print(' '.join(row))
+            print(f"✅ **Recovered Plaintext:** {plaintext}")
+
+        elif choice == '2':
+            passed, seconds = check_known_key()
+            if passed:
+                print(f"\n✅ Recovered the {CHECK_KEY} square in {seconds:.1f} s.")
+            else:
+                print(f"\n❌ Did not recover the {CHECK_KEY} square ({seconds:.1f} s).")
+
+        elif choice == '3':
+            print("\n👋 Exiting the program. Goodbye!")
+            break
+
+        else:
+            print("\n❌ Invalid choice. Please enter 1, 2 or 3.")
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,13 @@
+import math
+import os
 import string
+from concurrent.futures import ProcessPoolExecutor
+from itertools import cycle, islice
+
+import numpy as np
+
+from english_stats import text_to_indices
+from text_statistics import chi_squared, index_of_coincidence
 
 # --- Configuration ---
 ALPHABET_SIZE = 26
@@ -8,6 +17,20 @@ STANDARD_ALPHABET = string.ascii_uppercase
 char_to_int = {c: i for i, c in enumerate(STANDARD_ALPHABET)}
 int_to_char = {i: c for i, c in enumerate(STANDARD_ALPHABET)}
 
+# Cryptanalysis settings: longest key length tried, and the smallest number of
+# letters worth sending to another process (long ciphertexts are split into one
+# chunk per core).
+MAX_KEY_LENGTH = 20
+MIN_ANALYSIS_CHUNK_LETTERS = 1 << 18
+
+# Column counts are taken modulo a few shared periods (each a multiple of several
+# key lengths, at most MAX_COUNT_PERIOD) and folded down to every length.
+MAX_COUNT_PERIOD = 1 << 13
+
+# Kasiski examination only looks at the first KASISKI_LETTERS letters: the fraction
+# of repeat spacings divided by each length settles long before that.
+KASISKI_LETTERS = 1 << 16
+
 def get_key_stream(plaintext, key):
     """
     Generates a key stream the same length as the cleaned plaintext
@@ -66,6 +89,251 @@ def vigenere_process(text, key_stream, mode='encrypt'):
 
     return "".join(processed_text)
 
+def _to_codes(text):
+    """Views an (uppercased) string as an int64 array of code points. Returns (codes, encoding)."""
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(np.int64), 'ascii'
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64), 'utf-32-le'
+
+def _from_codes(codes, encoding):
+    """Inverse of _to_codes."""
+    dtype = np.uint8 if encoding == 'ascii' else np.uint32
+    return codes.astype(dtype).tobytes().decode(encoding)
+
+class VigenereCipher:
+    """
+    Stateful, vectorized Vigenère encryptor/decryptor.
+
+    The key stream is never built: the text is viewed as an array of character
+    codes, the letter positions are numbered with a cumulative sum, and the key
+    shift for each letter is looked up as key[(offset + position) % len(key)].
+    The offset is kept between update() calls, so processing a stream in chunks
+    gives exactly the same output as processing it in one piece.
+
+    Like vigenere_process, the text is uppercased and non-letters are preserved
+    (and do not advance the key).
+    """
+    def __init__(self, key, mode='encrypt'):
+        key = key.upper()
+        if not key or not all('A' <= c <= 'Z' for c in key):
+            raise ValueError("Key must contain only letters.")
+        sign = 1 if mode == 'encrypt' else -1
+        self.shifts = (sign * (np.frombuffer(key.encode('ascii'), dtype=np.uint8).astype(np.int64) - ord('A'))) % ALPHABET_SIZE
+        self.mode = mode
+        self.offset = 0
+
+    def reset(self):
+        """Restarts the key at its first letter."""
+        self.offset = 0
+
+    def update(self, text):
+        """Processes the next chunk of text and returns the result (string)."""
+        codes, encoding = _to_codes(text.upper())
+
+        is_letter = (codes >= ord('A')) & (codes <= ord('Z'))
+        letter_count = int(is_letter.sum())
+        
+        # Key index of every letter: offset, offset + 1, ... (non-letters are skipped)
+        key_index = (self.offset + np.arange(letter_count)) % len(self.shifts)
+        codes[is_letter] = (codes[is_letter] - ord('A') + self.shifts[key_index]) % ALPHABET_SIZE + ord('A')
+        self.offset = (self.offset + letter_count) % len(self.shifts)
+
+        return _from_codes(codes, encoding)
+
+def vigenere_encrypt(plaintext, key):
+    """One-shot Vigenère encryption: C = (P + K) mod 26."""
+    return VigenereCipher(key, mode='encrypt').update(plaintext)
+
+def vigenere_decrypt(ciphertext, key):
+    """One-shot Vigenère decryption: P = (C - K) mod 26."""
+    return VigenereCipher(key, mode='decrypt').update(ciphertext)
+
+def vigenere_many(texts, keys, mode='encrypt'):
+    """
+    Applies a different Vigenère key to each text in a single vectorized pass.
+
+    All texts are packed into one flat buffer with offsets, and all keys into a
+    second flat buffer. For every letter, the key letter is found from the letter's
+    position within its own record, so each record restarts its key exactly like
+    calling vigenere_encrypt(text, key) on it alone.
+
+    :param texts: List of strings.
+    :param keys: List of keywords (one per text), or a single keyword for all texts.
+    :return: List of processed strings.
+    """
+    texts = [text.upper() for text in texts]
+    if isinstance(keys, str):
+        keys = [keys] * len(texts)
+    keys = [key.upper() for key in keys]
+    if len(keys) != len(texts):
+        raise ValueError("Need exactly one key per text.")
+    if not texts:
+        return []
+    if not all(key and 'A' <= min(key) and max(key) <= 'Z' for key in keys):
+        raise ValueError("Keys must contain only letters.")
+
+    # 1. Pack the records and the keys into flat buffers
+    text_lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    text_ends = np.cumsum(text_lengths)
+    text_starts = text_ends - text_lengths
+    codes, encoding = _to_codes(''.join(texts))
+
+    key_lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    key_starts = np.cumsum(key_lengths) - key_lengths
+    sign = 1 if mode == 'encrypt' else -1
+    key_shifts = (sign * (np.frombuffer(''.join(keys).encode('ascii'), dtype=np.uint8).astype(np.int64) - ord('A'))) % ALPHABET_SIZE
+
+    # 2. Position of every letter within its own record (non-letters don't advance the key)
+    is_letter = (codes >= ord('A')) & (codes <= ord('Z'))
+    record = np.repeat(np.arange(len(texts)), text_lengths)
+    letters_before = np.concatenate([[0], np.cumsum(is_letter)])
+    letter_record = record[is_letter]
+    position = letters_before[:-1][is_letter] - letters_before[text_starts][letter_record]
+
+    # 3. Apply every record's key in one operation
+    shifts = key_shifts[key_starts[letter_record] + position % key_lengths[letter_record]]
+    codes[is_letter] = (codes[is_letter] - ord('A') + shifts) % ALPHABET_SIZE + ord('A')
+
+    # 4. Split the flat result back into records
+    result = _from_codes(codes, encoding)
+    return [result[start:end] for start, end in zip(text_starts.tolist(), text_ends.tolist())]
+
+def encrypt_many(texts, keys):
+    """Encrypts many records, each with its own keyword, in one vectorized pass."""
+    return vigenere_many(texts, keys, mode='encrypt')
+
+def decrypt_many(texts, keys):
+    """Decrypts many records, each with its own keyword, in one vectorized pass."""
+    return vigenere_many(texts, keys, mode='decrypt')
+
+def _count_periods(lengths):
+    """Groups the key lengths into a few periods, each a multiple of the lengths it covers."""
+    periods = []
+    for length in sorted(lengths, reverse=True):
+        for i, period in enumerate(periods):
+            merged = math.lcm(period, length)
+            if merged <= max(MAX_COUNT_PERIOD, period):
+                periods[i] = merged
+                break
+        else:
+            periods.append(length)
+    return periods
+
+def _column_counts(letters, start, lengths):
+    """
+    Letter counts of every column for every candidate key length.
+
+    'letters' starts at position 'start' of the whole ciphertext. Row r of the result
+    (there are sum(lengths) rows) holds the counts of column (r - first row of L) for
+    key length L. The letters are counted by position modulo each period from
+    _count_periods() with one bincount (3 passes for lengths 1..20), and the counts of
+    every length dividing the period are read off by folding it.
+    """
+    positions = start + np.arange(len(letters), dtype=np.int64)
+    blocks = {}
+    for period in _count_periods(lengths):
+        codes = positions % period * ALPHABET_SIZE + letters
+        counts = np.bincount(codes, minlength=period * ALPHABET_SIZE).reshape(period, ALPHABET_SIZE)
+        for length in lengths:
+            if length not in blocks and period % length == 0:
+                blocks[length] = counts.reshape(period // length, length, ALPHABET_SIZE).sum(axis=0)
+    return np.concatenate([blocks[length] for length in lengths])
+
+def _kasiski_scores(letters, lengths):
+    """
+    Kasiski examination: the spacing between consecutive repeats of each trigram is
+    usually a multiple of the key length. Returns, for every candidate length, the
+    fraction of spacings it divides. Only the first KASISKI_LETTERS letters are used.
+    """
+    letters = letters[:KASISKI_LETTERS]
+    if len(letters) < 3:
+        return np.zeros(len(lengths))
+    trigrams = letters[:-2] * ALPHABET_SIZE ** 2 + letters[1:-1] * ALPHABET_SIZE + letters[2:]
+    order = np.argsort(trigrams, kind='stable')
+    repeats = trigrams[order[1:]] == trigrams[order[:-1]]
+    spacings = (order[1:] - order[:-1])[repeats]
+    if len(spacings) == 0:
+        return np.zeros(len(lengths))
+    return (spacings[:, None] % np.asarray(lengths)[None, :] == 0).mean(axis=0)
+
+def analyse_key_lengths(ciphertext, max_key_length=MAX_KEY_LENGTH, workers=None):
+    """
+    Scores every key length from 1 to max_key_length at once.
+
+    Returns (lengths, ic, kasiski, column_counts):
+      ic            - mean index of coincidence of the columns for each length
+      kasiski       - fraction of repeat spacings divisible by each length
+      column_counts - list of (L, 26) letter count arrays, one per length
+    Long texts are split into one chunk per worker (of at least MIN_ANALYSIS_CHUNK_LETTERS)
+    and counted across a process pool.
+    """
+    letters = text_to_indices(ciphertext)
+    max_key_length = max(1, min(max_key_length, len(letters) // 2))
+    lengths = list(range(1, max_key_length + 1))
+
+    workers = workers or os.cpu_count() or 1
+    chunk_letters = max(MIN_ANALYSIS_CHUNK_LETTERS, -(-len(letters) // workers))
+    starts = list(range(0, len(letters), chunk_letters)) or [0]
+    chunks = [letters[start:start + chunk_letters] for start in starts]
+    workers = min(workers, len(chunks))
+    if workers == 1:
+        partial = [_column_counts(chunk, start, lengths) for chunk, start in zip(chunks, starts)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partial = list(pool.map(_column_counts, chunks, starts, [lengths] * len(chunks)))
+    counts = np.sum(partial, axis=0)
+
+    # Split the stacked rows back into one (L, 26) block per length
+    column_counts = np.split(counts, np.cumsum(lengths)[:-1])
+    ic = np.array([index_of_coincidence(block).mean() for block in column_counts])
+    return np.array(lengths), ic, _kasiski_scores(letters, lengths), column_counts
+
+def estimate_key_length(ciphertext, max_key_length=MAX_KEY_LENGTH, workers=None):
+    """
+    Estimates the Vigenère key length with the index of coincidence and Kasiski spacing.
+
+    Lengths whose columns look like English (IC close to the best) are kept; that
+    rules out divisors of the true length. Among them the one that divides the most
+    repeat spacings wins, which rules out multiples of the true length.
+    """
+    lengths, ic, kasiski, _ = analyse_key_lengths(ciphertext, max_key_length, workers)
+    return _pick_key_length(lengths, ic, kasiski)
+
+def _pick_key_length(lengths, ic, kasiski):
+    candidates = np.flatnonzero(ic >= 0.9 * ic.max())
+    return int(lengths[candidates[np.argmax(kasiski[candidates])]])
+
+def recover_key(column_counts):
+    """
+    Recovers one key letter per column: the shift whose decryption gives the
+    lowest chi-squared distance from English. All 26 shifts of all columns are
+    scored in a single array operation.
+    """
+    shifts = np.arange(ALPHABET_SIZE)
+    # rotated[c, s, p] = count of cipher letter (p + s) in column c, i.e. plaintext letter p under shift s
+    rotated = column_counts[:, (shifts[:, None] + shifts[None, :]) % ALPHABET_SIZE]
+    best = chi_squared(rotated).argmin(axis=1)
+    return ''.join(int_to_char[int(s)] for s in best)
+
+def crack_vigenere(ciphertext, max_key_length=MAX_KEY_LENGTH, key_length=None, workers=None):
+    """
+    Ciphertext-only attack: estimates the key length (unless given) and recovers
+    each key letter by chi-squared over the strided columns.
+    Returns (key, plaintext).
+    """
+    if len(text_to_indices(ciphertext)) < 2:
+        raise ValueError("Ciphertext is too short to analyse.")
+    lengths, ic, kasiski, column_counts = analyse_key_lengths(
+        ciphertext, max(max_key_length, key_length or 0), workers)
+
+    if key_length is None:
+        key_length = _pick_key_length(lengths, ic, kasiski)
+    elif key_length > len(column_counts):
+        raise ValueError("Key length must be at most half the ciphertext length.")
+
+    key = recover_key(column_counts[key_length - 1])
+    return key, vigenere_decrypt(ciphertext, key)
+
 def main():
     """Main menu-driven program loop."""
     print("--- 📝 Vigenère (Polyalphabetic) Cipher Program ---")
@@ -83,40 +351,51 @@ def main():
         print("\n--- Menu ---")
         print("1. **Encrypt** a message")
         print("2. **Decrypt** a message")
-        print("3. **Exit**")
+        print("3. **Crack** a ciphertext (unknown key)")
+        print("4. **Exit**")
         
-        choice = input("Enter your choice (1, 2, or 3): ").strip()
+        choice = input("Enter your choice (1, 2, 3, or 4): ").strip()
         
         if choice == '1':
             # --- ENCRYPTION ---
             plaintext = input("Enter the message to **encrypt**: ")
             
-            # Key stream generation is crucial: non-letters in plaintext are handled
-            key_stream = get_key_stream(plaintext, key)
-            ciphertext = vigenere_process(plaintext, key_stream, mode='encrypt')
+            ciphertext = vigenere_encrypt(plaintext, key)
             
-            # Displaying the key stream over the plaintext
-            print("\n   Plaintext:  ", ' '.join(c for c in plaintext.upper() if c.isalpha()))
-            print("   Key Stream: ", ' '.join(key_stream[i] for i, c in enumerate(plaintext.upper()) if c.isalpha()))
+            # Displaying the key over the plaintext letters (non-letters do not advance it)
+            letters = [c for c in plaintext.upper() if 'A' <= c <= 'Z']
+            print("\n   Plaintext:  ", ' '.join(letters))
+            print("   Key Stream: ", ' '.join(islice(cycle(key.upper()), len(letters))))
             print(f"✅ **Ciphertext:** {ciphertext}")
             
         elif choice == '2':
             # --- DECRYPTION ---
             ciphertext = input("Enter the message to **decrypt**: ")
             
-            # The key stream generated here must match the one used during encryption
-            key_stream = get_key_stream(ciphertext, key)
-            decrypted_text = vigenere_process(ciphertext, key_stream, mode='decrypt')
+            # The key is applied from its first letter, matching the encryption
+            decrypted_text = vigenere_decrypt(ciphertext, key)
             
             print(f"\n✅ **Decrypted Plaintext:** {decrypted_text}")
             
         elif choice == '3':
+            # --- CRYPTANALYSIS ---
+            ciphertext = input("Enter the message to **crack**: ")
+            try:
+                found_key, decrypted_text = crack_vigenere(ciphertext)
+            except ValueError as e:
+                print(f"\n❌ {e}")
+                continue
+            
+            print(f"\n✅ **Recovered Key:** {found_key}")
+            print(f"✅ **Decrypted Plaintext:** {decrypted_text}")
+            
+        elif choice == '4':
             # --- EXIT ---
             print("\n👋 Exiting the Vigenère program. Goodbye!")
             break
             
         else:
-            print("\n❌ Invalid choice. Please enter 1, 2, or 3.")
+            print("\n❌ Invalid choice. Please enter 1, 2, 3, or 4.")
             
 # Execute the main function
 if __name__ == "__main__":
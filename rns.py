@@ -0,0 +1,141 @@
+import numpy as np
+
+from number_theory import WORD_MODULUS_LIMIT, CRTBasis
+
+# --- Configuration ---
+# Number of default moduli: four primes just below 2**31 give a dynamic range of about 2**124.
+DEFAULT_MODULUS_COUNT = 4
+
+def _is_prime(n):
+    """Deterministic Miller-Rabin for n < 2**32 (bases 2, 7 and 61 are enough)."""
+    if n < 2:
+        return False
+    for p in (2, 7, 61):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 7, 61):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def default_moduli(count=DEFAULT_MODULUS_COUNT):
+    """The 'count' largest primes below WORD_MODULUS_LIMIT, largest first."""
+    moduli = []
+    candidate = WORD_MODULUS_LIMIT - 1
+    while len(moduli) < count:
+        if _is_prime(candidate):
+            moduli.append(candidate)
+        candidate -= 2
+    return moduli
+
+class ResidueNumberSystem:
+    """
+    Residue number system over a fixed set of word-sized, pairwise coprime moduli.
+
+    A number x in [0, M) (M = product of the moduli) is stored as its residues
+    x mod m_i. Many numbers form an int64 array of shape (count, k), one row per
+    number, so addition, subtraction and multiplication mod M are element-wise
+    array operations with no carries between the columns. Every modulus is
+    below 2**31, so the product of two residues always fits in int64.
+
+    Conversion back to integers uses the precomputed Garner basis (CRTBasis).
+    All arithmetic is modulo M: results outside [0, M) wrap around.
+    """
+    def __init__(self, moduli=None):
+        moduli = default_moduli() if moduli is None else [int(m) for m in moduli]
+        if any(m >= WORD_MODULUS_LIMIT for m in moduli):
+            raise ValueError(f"RNS moduli must be below {WORD_MODULUS_LIMIT}.")
+        # Raises ValueError if the moduli are not pairwise coprime
+        self.basis = CRTBasis(moduli)
+        self.moduli = np.array(moduli, dtype=np.int64)
+        self.modulus = self.basis.modulus
+
+    def encode(self, values):
+        """Residues of a sequence of integers (Python ints of any size), shape (count, k)."""
+        values = np.asarray(values)
+        if values.dtype == np.uint64:
+            # uint64 % int64 would go through float64
+            values = values.astype(object)
+        elif values.dtype != object and not np.issubdtype(values.dtype, np.integer):
+            raise ValueError("RNS values must be integers.")
+        # int64 input stays on the fast path; larger ints arrive as an object array
+        residues = values.reshape(-1, 1) % self.moduli
+        return residues.astype(np.int64)
+
+    def decode(self, residues):
+        """Integers in [0, M) for an array of residue rows (int64 if M < 2**63, Python ints otherwise)."""
+        return self.basis.solve_many(np.asarray(residues, dtype=np.int64).reshape(-1, len(self.moduli)))
+
+    def add(self, a, b):
+        """(a + b) mod M, row by row."""
+        return (a + b) % self.moduli
+
+    def subtract(self, a, b):
+        """(a - b) mod M, row by row."""
+        return (a - b) % self.moduli
+
+    def negate(self, a):
+        """(-a) mod M, row by row."""
+        return -a % self.moduli
+
+    def multiply(self, a, b):
+        """(a * b) mod M, row by row."""
+        return a * b % self.moduli
+
+    def power(self, a, exponent):
+        """a ** exponent mod M for every row, by square-and-multiply on whole arrays."""
+        if exponent < 0:
+            raise ValueError("Exponent must be non-negative.")
+        result = np.ones_like(a)
+        base = a % self.moduli
+        while exponent:
+            if exponent & 1:
+                result = result * base % self.moduli
+            base = base * base % self.moduli
+            exponent >>= 1
+        return result
+
+    def sum(self, a):
+        """The sum of all rows mod M, as a single residue row."""
+        # Reduce in chunks so the int64 column sums cannot overflow
+        total = np.zeros(len(self.moduli), dtype=np.int64)
+        for start in range(0, len(a), 1 << 30):
+            total = (total + a[start:start + (1 << 30)].sum(axis=0) % self.moduli) % self.moduli
+        return total.reshape(1, -1)
+
+def main():
+    """Small demonstration: adds and multiplies two lists of numbers in RNS form."""
+    print("--- 🧮 Residue Number System Calculator ---")
+    rns = ResidueNumberSystem()
+    print(f"Moduli: {', '.join(str(m) for m in rns.moduli)}")
+    print(f"Dynamic range M = {rns.modulus} (results are reduced mod M)")
+
+    try:
+        a = [int(x) for x in input("Enter the first numbers (space separated): ").split()]
+        b = [int(x) for x in input("Enter the same count of second numbers: ").split()]
+        if len(a) != len(b) or not a:
+            raise ValueError("Both lists must have the same, non-zero length.")
+    except ValueError as e:
+        print(f"\n❌ Error: {e}")
+        return
+
+    ra, rb = rns.encode(a), rns.encode(b)
+    sums = rns.decode(rns.add(ra, rb))
+    products = rns.decode(rns.multiply(ra, rb))
+    for x, y, s, p in zip(a, b, sums, products):
+        print(f"✅ {x} + {y} = {s}    {x} * {y} = {p}")
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,40 @@
 import math
 
+import numpy as np
+
+from transposition import BLOCK_SIZE, array_to_text, text_to_array, transpose_file
+
+# Transposition pipeline of this cipher (see transposition.py)
+ROW_COLUMN_STAGES = ('rowcolumn',)
+
+# Separates the padding length from the ciphertext in the header
+HEADER_SEPARATOR = ':'
+
+# --- HEADER ---
+
+def _format_header(padding: int) -> str:
+    """Header written in front of the ciphertext: the number of padding characters, then HEADER_SEPARATOR."""
+    return f"{padding}{HEADER_SEPARATOR}"
+
+def _parse_header(ciphertext: str):
+    """Splits a ciphertext into (padding, body). Raises ValueError if the header is missing or invalid."""
+    padding, separator, body = ciphertext.partition(HEADER_SEPARATOR)
+    if not separator or not padding.isdigit():
+        raise ValueError("Ciphertext has no padding header. Pass original_length for headerless ciphertext.")
+    return int(padding), body
+
 # --- ENCRYPTION FUNCTION ---
 
-def row_column_rail_fence_encrypt(plaintext: str, rows: int) -> str:
+def row_column_rail_fence_encrypt(plaintext: str, rows: int, header: bool = True) -> str:
     """
     Encrypts a plaintext message using the Row-Column Rail Fence cipher.
     Writes row-by-row, reads column-by-column.
     Pads with 'X' if necessary.
+
+    The grid is never built cell by cell: the padded text is viewed as a
+    rows x columns array and read through its transpose (.T).
+    With header=True (default) the ciphertext starts with the padding length
+    (e.g. "2:..."), so decryption does not need the original length.
     """
     # Remove spaces and convert to uppercase for standard cipher operation
     plaintext_clean = plaintext.replace(" ", "").upper()
@@ -20,60 +48,80 @@ def row_column_rail_fence_encrypt(plaintext: str, rows: int) -> str:
     padding_needed = grid_size - L
     padded_plaintext = plaintext_clean + 'X' * padding_needed
     
-    # 1. Initialize the grid (matrix)
-    grid = [['' for _ in range(columns)] for _ in range(rows)]
-    
-    # 2. Transposition: Write the padded plaintext into the grid row by row
-    for k in range(grid_size):
-        r = k // columns
-        c = k % columns
-        grid[r][c] = padded_plaintext[k]
+    # 1. Transposition: view the padded plaintext as the grid, row by row (no copy)
+    chars, encoding = text_to_array(padded_plaintext)
+    grid = chars.reshape(rows, columns)
         
-    # 3. Readout: Read the ciphertext column by column
-    ciphertext = []
-    for c in range(columns):
-        for r in range(rows):
-            ciphertext.append(grid[r][c])
+    # 2. Readout: the transposed view lists the grid column by column
+    ciphertext = array_to_text(grid.T, encoding)
             
-    return "".join(ciphertext)
+    return _format_header(padding_needed) + ciphertext if header else ciphertext
 
 # --- DECRYPTION FUNCTION ---
 
-def row_column_rail_fence_decrypt(ciphertext: str, rows: int, original_length: int) -> str:
+def row_column_rail_fence_decrypt(ciphertext: str, rows: int, original_length: int = None,
+                                  header: bool = None) -> str:
     """
     Decrypts a ciphertext message using the Row-Column Rail Fence cipher.
     Writes column-by-column, reads row-by-row, then depads.
+
+    header mirrors row_column_rail_fence_encrypt: True means the ciphertext starts
+    with the padding header, False means it does not (original_length is then required).
+    By default (None) the header is expected unless original_length is passed and the
+    ciphertext is exactly one padded grid long, so the legacy call
+    decrypt(ciphertext, rows, original_length) works on both kinds of ciphertext.
     """
+    if header is None:
+        # A headerless ciphertext is always a whole grid; the header adds at least 2 characters
+        header = original_length is None or len(ciphertext) != rows * math.ceil(original_length / rows)
+    if header:
+        padding, ciphertext = _parse_header(ciphertext)
+    elif original_length is None:
+        raise ValueError("original_length is required to decrypt a headerless ciphertext.")
     L_cipher = len(ciphertext)
     
     # Calculate dimensions
     columns = math.ceil(L_cipher / rows)
+    chars, encoding = text_to_array(ciphertext)
     
-    # 1. Grid Formation: Initialize the grid and fill it column by column
-    grid = [['' for _ in range(columns)] for _ in range(rows)]
+    if L_cipher == rows * columns:
+        # 1. Grid Formation: the ciphertext is the grid column by column, so it is a
+        #    columns x rows array; its transpose is the grid read row by row (no copy)
+        full_text = array_to_text(chars.reshape(columns, rows).T, encoding)
+    else:
+        # Incomplete last column: gather the filled cells in row-by-row order
+        cell = np.arange(rows * columns).reshape(columns, rows).T.ravel()
+        full_text = array_to_text(chars[cell[cell < L_cipher]], encoding)
     
-    k = 0 # Index for the ciphertext
-    # Fill the grid column by column
-    for c in range(columns):
-        for r in range(rows):
-            if k < L_cipher:
-                grid[r][c] = ciphertext[k]
-                k += 1
-                
-    # 2. Readout: Read the padded plaintext row by row
-    padded_plaintext = []
-    for r in range(rows):
-        for c in range(columns):
-            padded_plaintext.append(grid[r][c])
-            
-    full_text = "".join(padded_plaintext)
-    
-    # 3. Depadding: Trim to the original length
+    # 2. Depadding: Trim to the original length
     # Note: We return the text as uppercase since the encryption process converted it.
+    if original_length is None:
+        original_length = len(full_text) - padding
     plaintext = full_text[:original_length]
     
     return plaintext
 
+# --- FILE FUNCTIONS ---
+
+def row_column_rail_fence_encrypt_file(input_path: str, output_path: str, rows: int,
+                                       block_size: int = BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Encrypts a file of any size with the Row-Column Rail Fence cipher.
+    The file is memory-mapped and each block (a whole rows x columns grid) is
+    written row-by-row and read column-by-column. Bytes are transposed as they
+    are: no cleaning, no uppercasing, and a short last block is not padded.
+    Returns the number of bytes processed.
+    """
+    return transpose_file(input_path, output_path, rows, ROW_COLUMN_STAGES, 'encrypt', block_size, workers)
+
+def row_column_rail_fence_decrypt_file(input_path: str, output_path: str, rows: int,
+                                       block_size: int = BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Decrypts a file written by row_column_rail_fence_encrypt_file (same rows and block_size).
+    Returns the number of bytes processed.
+    """
+    return transpose_file(input_path, output_path, rows, ROW_COLUMN_STAGES, 'decrypt', block_size, workers)
+
 # --- USER INPUT AND EXECUTION ---
 
 if __name__ == "__main__":
@@ -97,15 +145,11 @@ if __name__ == "__main__":
 
     # --- Execution ---
     
-    # Store the length of the *original* message before cleaning/padding
-    original_length = len(user_plaintext.replace(" ", ""))
-    
     print("\n" + "=" * 40)
     print("      ROW-COLUMN RAIL FENCE CIPHER")
     print("=" * 40)
     print(f"Original Text: {user_plaintext}")
     print(f"Key (Rows): {user_rows}")
-    print(f"Cleaned Length (for Decryption): {original_length}")
     print("-" * 40)
     
     # 1. ENCRYPT
@@ -113,7 +157,7 @@ if __name__ == "__main__":
     print(f"Ciphertext: {ciphertext}")
     print("-" * 40)
     
-    # 2. DECRYPT
-    decrypted_text = row_column_rail_fence_decrypt(ciphertext, user_rows, original_length)
+    # 2. DECRYPT (the padding length is read from the ciphertext header)
+    decrypted_text = row_column_rail_fence_decrypt(ciphertext, user_rows)
     print(f"Decrypted Text: {decrypted_text}")
     print("=" * 40)
\ No newline at end of file
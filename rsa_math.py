@@ -0,0 +1,225 @@
+import math
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from number_theory import mod_inverse
+
+# --- Configuration ---
+DEFAULT_KEY_BITS = 2048
+PUBLIC_EXPONENT = 65537
+MILLER_RABIN_ROUNDS = 40
+
+# Candidates are first checked against these small primes, which rejects most
+# composites before the (much slower) Miller-Rabin rounds.
+SMALL_PRIMES = [p for p in range(3, 2000, 2) if all(p % d for d in range(3, int(p ** 0.5) + 1, 2))]
+
+# Ciphertexts per task when decrypt_many() spreads work across processes
+BATCH_CHUNK_SIZE = 256
+
+# NOTE: this is textbook RSA (no padding). It is meant for arithmetic,
+# experiments and benchmarks, not for protecting real messages; rsa_server.py
+# keeps using PKCS#1 OAEP from pycryptodome for that.
+
+def is_probable_prime(n, rounds=MILLER_RABIN_ROUNDS):
+    """Miller-Rabin primality test with random bases."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(rounds):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def generate_prime(bits, e=PUBLIC_EXPONENT):
+    """A random prime of exactly 'bits' bits with gcd(e, p - 1) = 1."""
+    while True:
+        # Top two bits set, so the product of two such primes has exactly 2 * bits bits
+        candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        if math.gcd(e, candidate - 1) == 1 and is_probable_prime(candidate):
+            return candidate
+
+class RSAPublicKey:
+    """Public key (n, e). Messages are integers in [0, n)."""
+    def __init__(self, n, e=PUBLIC_EXPONENT):
+        self.n = n
+        self.e = e
+
+    @property
+    def size_in_bytes(self):
+        return (self.n.bit_length() + 7) // 8
+
+    def encrypt(self, message):
+        """c = m^e mod n."""
+        if not 0 <= message < self.n:
+            raise ValueError("Message representative out of range (must be 0 <= m < n).")
+        return pow(message, self.e, self.n)
+
+    def encrypt_many(self, messages):
+        """Encrypts a sequence of message integers."""
+        return [self.encrypt(m) for m in messages]
+
+class RSAPrivateKey(RSAPublicKey):
+    """
+    Private key with the CRT parameters precomputed (as in PKCS#1):
+      dP = d mod (p - 1), dQ = d mod (q - 1), qInv = q^-1 mod p
+
+    decrypt() does two half-size exponentiations, m1 = c^dP mod p and
+    m2 = c^dQ mod q, and joins them with Garner's formula
+      m = m2 + q * (qInv * (m1 - m2) mod p)
+    which is the two-modulus case of CRT. Exponents and moduli are half the size,
+    so this is about 3-4x faster than pow(c, d, n).
+    """
+    def __init__(self, p, q, e=PUBLIC_EXPONENT):
+        if p == q:
+            raise ValueError("p and q must be different primes.")
+        super().__init__(p * q, e)
+        self.p = p
+        self.q = q
+        # Raises ValueError if e is not invertible mod phi(n)
+        self.d = mod_inverse(e, (p - 1) * (q - 1))
+        self.dP = self.d % (p - 1)
+        self.dQ = self.d % (q - 1)
+        self.qInv = mod_inverse(q, p)
+
+    def public_key(self):
+        return RSAPublicKey(self.n, self.e)
+
+    def decrypt(self, ciphertext):
+        """m = c^d mod n, computed with the CRT parameters."""
+        if not 0 <= ciphertext < self.n:
+            raise ValueError("Ciphertext representative out of range (must be 0 <= c < n).")
+        m1 = pow(ciphertext, self.dP, self.p)
+        m2 = pow(ciphertext, self.dQ, self.q)
+        return m2 + (m1 - m2) * self.qInv % self.p * self.q
+
+    def decrypt_without_crt(self, ciphertext):
+        """m = c^d mod n as a single full-size exponentiation (for comparison)."""
+        if not 0 <= ciphertext < self.n:
+            raise ValueError("Ciphertext representative out of range (must be 0 <= c < n).")
+        return pow(ciphertext, self.d, self.n)
+
+    def decrypt_many(self, ciphertexts, workers=None):
+        """
+        Decrypts many ciphertexts. Chunks of BATCH_CHUNK_SIZE are spread across a
+        process pool; the results keep the input order.
+        """
+        ciphertexts = list(ciphertexts)
+        if any(not 0 <= c < self.n for c in ciphertexts):
+            raise ValueError("Ciphertext representative out of range (must be 0 <= c < n).")
+
+        tasks = [(self, ciphertexts[i:i + BATCH_CHUNK_SIZE]) for i in range(0, len(ciphertexts), BATCH_CHUNK_SIZE)]
+        workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+        if workers == 1:
+            results = [_decrypt_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_decrypt_chunk, tasks))
+        return [m for chunk in results for m in chunk]
+
+def _decrypt_chunk(args):
+    key, ciphertexts = args
+    return [key.decrypt(c) for c in ciphertexts]
+
+def generate_keypair(bits=DEFAULT_KEY_BITS, e=PUBLIC_EXPONENT):
+    """Generates an RSA private key with a modulus of exactly 'bits' bits."""
+    if bits < 16:
+        raise ValueError("Key size must be at least 16 bits.")
+    p = generate_prime(bits - bits // 2, e)
+    q = generate_prime(bits // 2, e)
+    while q == p:
+        q = generate_prime(bits // 2, e)
+    return RSAPrivateKey(p, q, e)
+
+def bytes_to_int(data):
+    """Big-endian bytes -> integer (like PKCS#1 OS2IP)."""
+    return int.from_bytes(data, 'big')
+
+def int_to_bytes(value, length=None):
+    """Integer -> big-endian bytes (like PKCS#1 I2OSP); minimal length by default."""
+    length = length or max(1, (value.bit_length() + 7) // 8)
+    return value.to_bytes(length, 'big')
+
+def benchmark_private_operations(key, count=200):
+    """Times 'count' decryptions with pow(c, d, n) and with the CRT. Returns (plain_seconds, crt_seconds)."""
+    ciphertexts = [secrets.randbelow(key.n) for _ in range(count)]
+
+    started = time.perf_counter()
+    plain = [key.decrypt_without_crt(c) for c in ciphertexts]
+    plain_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    crt = [key.decrypt(c) for c in ciphertexts]
+    crt_seconds = time.perf_counter() - started
+
+    if plain != crt:
+        raise ValueError("CRT decryption does not match pow(c, d, n).")
+    return plain_seconds, crt_seconds
+
+def main():
+    """Menu-driven textbook RSA demonstration."""
+    print("--- 🔑 Textbook RSA (CRT private operations) ---")
+    key = generate_keypair()
+    print(f"Generated a {key.n.bit_length()}-bit key (e = {key.e}).")
+
+    while True:
+        print("\n--- Menu ---")
+        print("1. **Encrypt and decrypt** a short message")
+        print("2. **Benchmark** pow(c, d, n) against the CRT")
+        print("3. **Generate** a new key")
+        print("4. **Exit**")
+
+        choice = input("Enter your choice (1-4): ").strip()
+
+        if choice == '1':
+            message = input("Enter the message: ").encode('utf-8')
+            m = bytes_to_int(message)
+            if m >= key.n:
+                print(f"\n❌ Message too long for this key (max {key.size_in_bytes - 1} bytes).")
+                continue
+            c = key.public_key().encrypt(m)
+            print(f"\n✅ **Ciphertext:** {c:x}")
+            print(f"✅ **Decrypted:** {int_to_bytes(key.decrypt(c), len(message)).decode('utf-8')}")
+
+        elif choice == '2':
+            plain_seconds, crt_seconds = benchmark_private_operations(key)
+            print(f"\npow(c, d, n): {plain_seconds * 1000 / 200:.2f} ms per decryption")
+            print(f"CRT:          {crt_seconds * 1000 / 200:.2f} ms per decryption")
+            print(f"✅ Speed-up: {plain_seconds / crt_seconds:.1f}x")
+
+        elif choice == '3':
+            try:
+                bits = int(input("Key size in bits (e.g. 2048): "))
+                key = generate_keypair(bits)
+            except ValueError as e:
+                print(f"\n❌ Error: {e}")
+                continue
+            print(f"\n✅ Generated a {key.n.bit_length()}-bit key.")
+
+        elif choice == '4':
+            print("\n👋 Exiting the program. Goodbye!")
+            break
+
+        else:
+            print("\n❌ Invalid choice. Please enter 1, 2, 3 or 4.")
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import numpy as np
+
+from english_stats import letter_probabilities, text_to_indices
+
+# --- Configuration ---
+ALPHABET_SIZE = 26
+PLAYFAIR_ALPHABET_SIZE = 25
+
+# Chunk size (in bytes) used when reading files.
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Lookup table: A..Z letter index -> Playfair index (J merged into I)
+_TO_PLAYFAIR = np.array([i if i < 9 else (8 if i == 9 else i - 1) for i in range(ALPHABET_SIZE)], dtype=np.int64)
+
+def _playfair_pairs(letters):
+    """25 x 25 counts of the non-overlapping pairs of Playfair letters (an odd last letter is left out)."""
+    usable = len(letters) - len(letters) % 2
+    digraphs = letters[:usable:2] * PLAYFAIR_ALPHABET_SIZE + letters[1:usable:2]
+    return np.bincount(digraphs, minlength=PLAYFAIR_ALPHABET_SIZE ** 2).reshape(
+        PLAYFAIR_ALPHABET_SIZE, PLAYFAIR_ALPHABET_SIZE)
+
+class TextStatistics:
+    """
+    Letter statistics accumulated over one or more buffers.
+
+    Counts (all NumPy arrays):
+      unigrams          - 26 letter counts
+      digrams           - 26 x 26 overlapping letter pair counts
+      trigrams          - 26 x 26 x 26 overlapping letter triple counts
+      playfair_digraphs - 25 x 25 counts of the non-overlapping pairs a Playfair
+                          cipher works on (J merged into I)
+
+    Each update() converts the buffer to letter indices once and builds every
+    table from that array with np.bincount. The last letters of a chunk are
+    carried over, so feeding a text in chunks gives exactly the same counts as
+    feeding it in one piece. merge() gives the same counts as well.
+    """
+    def __init__(self):
+        self.unigrams = np.zeros(ALPHABET_SIZE, dtype=np.int64)
+        self.digrams = np.zeros((ALPHABET_SIZE, ALPHABET_SIZE), dtype=np.int64)
+        self.trigrams = np.zeros((ALPHABET_SIZE,) * 3, dtype=np.int64)
+        self.playfair_digraphs = np.zeros((PLAYFAIR_ALPHABET_SIZE, PLAYFAIR_ALPHABET_SIZE), dtype=np.int64)
+        # Playfair pairs aligned to the second letter of the text instead of the first,
+        # so merge() can append this text after one with an odd number of letters
+        self._playfair_shifted = np.zeros_like(self.playfair_digraphs)
+        # Up to two letters from the start and from the end of the text
+        self._head = np.empty(0, dtype=np.int64)
+        self._tail = np.empty(0, dtype=np.int64)
+
+    def update(self, data):
+        """Adds the letters of 'data' to the counts. Returns self."""
+        new = text_to_indices(data)
+        if len(new) == 0:
+            return self
+        count = self.total
+        tail_length = len(self._tail)
+        letters = np.concatenate([self._tail, new]) if tail_length else new
+
+        self.unigrams += np.bincount(new, minlength=ALPHABET_SIZE)
+
+        # Overlapping n-grams that end in the new letters (the carried tail supplies their start)
+        pairs = letters[:-1] * ALPHABET_SIZE + letters[1:]
+        pairs = pairs[max(tail_length - 1, 0):]
+        self.digrams += np.bincount(pairs, minlength=ALPHABET_SIZE ** 2).reshape(self.digrams.shape)
+
+        triples = letters[:-2] * ALPHABET_SIZE ** 2 + letters[1:-1] * ALPHABET_SIZE + letters[2:]
+        triples = triples[max(tail_length - 2, 0):]
+        self.trigrams += np.bincount(triples, minlength=ALPHABET_SIZE ** 3).reshape(self.trigrams.shape)
+
+        # Non-overlapping Playfair pairs. After an odd number of letters the last one is
+        # still unpaired in the alignment from the first letter, after an even number
+        # (but at least one) in the alignment from the second letter.
+        playfair = _TO_PLAYFAIR[new]
+        if count % 2:
+            self.playfair_digraphs += _playfair_pairs(np.concatenate([_TO_PLAYFAIR[self._tail[-1:]], playfair]))
+            self._playfair_shifted += _playfair_pairs(playfair)
+        else:
+            self.playfair_digraphs += _playfair_pairs(playfair)
+            self._playfair_shifted += _playfair_pairs(
+                np.concatenate([_TO_PLAYFAIR[self._tail[-1:]], playfair]) if count else playfair[1:])
+
+        self._head = np.concatenate([self._head, new[:2]])[:2]
+        self._tail = letters[-2:].copy()
+        return self
+
+    def merge(self, other):
+        """
+        Adds the counts of another TextStatistics (e.g. from a separate document or
+        a chunk counted in another process), as if its text followed this one:
+        n-grams spanning the boundary are counted, and Playfair pairs stay aligned
+        to the start of the combined text. Returns self.
+        """
+        if other.total == 0:
+            return self
+        count = self.total
+        self.unigrams += other.unigrams
+        self.digrams += other.digrams
+        self.trigrams += other.trigrams
+
+        # Overlapping n-grams that start in this text and end in the other
+        window = np.concatenate([self._tail, other._head])
+        split = len(self._tail)
+        for n, table in ((2, self.digrams), (3, self.trigrams)):
+            for i in range(max(split - n + 1, 0), min(split, len(window) - n + 1)):
+                table[tuple(window[i:i + n])] += 1
+
+        # The other text's pairs keep their alignment after an even count and swap it after an odd one
+        boundary = np.zeros_like(self.playfair_digraphs)
+        if count:
+            boundary[_TO_PLAYFAIR[self._tail[-1]], _TO_PLAYFAIR[other._head[0]]] = 1
+        if count % 2:
+            self.playfair_digraphs += boundary + other._playfair_shifted
+            self._playfair_shifted += other.playfair_digraphs
+        else:
+            self.playfair_digraphs += other.playfair_digraphs
+            self._playfair_shifted += boundary + other._playfair_shifted
+
+        self._head = np.concatenate([self._head, other._head])[:2]
+        self._tail = np.concatenate([self._tail, other._tail])[-2:]
+        return self
+
+    @property
+    def total(self):
+        """Number of letters counted."""
+        return int(self.unigrams.sum())
+
+    def frequencies(self):
+        """Relative letter frequencies (26 values that sum to 1)."""
+        total = self.total
+        return self.unigrams / total if total else np.zeros(ALPHABET_SIZE)
+
+    def index_of_coincidence(self):
+        """Probability that two letters drawn at random are the same (about 0.067 for English)."""
+        return index_of_coincidence(self.unigrams)
+
+    def chi_squared(self, expected=None):
+        """Chi-squared distance of the letter counts from English (or from 'expected' probabilities)."""
+        return chi_squared(self.unigrams, expected)
+
+def index_of_coincidence(counts):
+    """Index of coincidence of the letter counts along the last axis (works on a batch of count rows)."""
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ic = (counts * (counts - 1)).sum(axis=-1) / (n * (n - 1))
+    return np.where(n > 1, ic, 0.0)
+
+def chi_squared(counts, expected=None):
+    """
+    Chi-squared statistic of the letter counts along the last axis against the
+    expected probabilities (English by default). Lower means more English-like.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = letter_probabilities() if expected is None else np.asarray(expected, dtype=np.float64)
+    expected_counts = counts.sum(axis=-1, keepdims=True) * expected
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(expected_counts > 0, (counts - expected_counts) ** 2 / expected_counts, 0.0)
+    return terms.sum(axis=-1)
+
+def analyse(data):
+    """Returns the TextStatistics of a single buffer."""
+    return TextStatistics().update(data)
+
+def analyse_file(path, chunk_size=CHUNK_SIZE):
+    """Returns the TextStatistics of a file, read in chunks so it may be larger than RAM."""
+    stats = TextStatistics()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            stats.update(chunk)
+    return stats
+
+def main():
+    """Prints the statistics of a message or a file."""
+    print("--- 📊 Ciphertext Statistics ---")
+    source = input("Enter a message, or @path to analyse a file: ")
+
+    try:
+        stats = analyse_file(source[1:]) if source.startswith('@') else analyse(source)
+    except OSError as e:
+        print(f"\n❌ Could not read the file: {e}")
+        return
+
+    print(f"\nLetters counted:      {stats.total}")
+    print(f"Index of coincidence: {stats.index_of_coincidence():.4f}  (English ~0.0667, random ~0.0385)")
+    print(f"Chi-squared vs English: {stats.chi_squared():.2f}")
+
+    letters = [chr(ord('A') + i) for i in range(ALPHABET_SIZE)]
+    order = np.argsort(-stats.unigrams, kind='stable')
+    print("\nTop letters:  ", ' '.join(f"{letters[i]}:{stats.unigrams[i]}" for i in order[:10]))
+    top = np.argsort(-stats.digrams.ravel(), kind='stable')[:10]
+    print("Top digrams:  ", ' '.join(f"{letters[i // 26]}{letters[i % 26]}:{stats.digrams.ravel()[i]}" for i in top))
+    top = np.argsort(-stats.trigrams.ravel(), kind='stable')[:10]
+    print("Top trigrams: ", ' '.join(
+        f"{letters[i // 676]}{letters[i // 26 % 26]}{letters[i % 26]}:{stats.trigrams.ravel()[i]}" for i in top))
+
+# Execute the main function
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from english_stats import ngram_codes, ngram_log_probabilities, text_to_indices
+
+# --- Configuration ---
+# Composed permutations (and their inverses) are cached only for texts of up to
+# CACHE_MAX_LENGTH characters. Each entry holds one int32 index per character, so
+# each of the two caches stays below PERMUTATION_CACHE_SIZE * CACHE_MAX_LENGTH * 4
+# bytes (16 MB); longer texts build their permutation on every call.
+PERMUTATION_CACHE_SIZE = 64
+CACHE_MAX_LENGTH = 1 << 16
+
+# Block size (in bytes) for file transposition. Each block is transposed on its
+# own, so memory use is bounded by a few blocks per worker whatever the file size.
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# Rail-count search: candidates are ranked by the quadgram score of their first
+# SCORE_PREFIX characters, which is plenty to tell English from a wrong guess.
+NGRAM_SIZE = 4
+SCORE_PREFIX = 500
+TOP_CANDIDATES = 5
+# Characters decrypted per batch of rail counts (batch size = SCORE_BATCH_CHARS // SCORE_PREFIX)
+SCORE_BATCH_CHARS = 1 << 18
+
+def text_to_array(text):
+    """
+    Views a string as a NumPy array of character codes, so a transposition becomes
+    a single gather. Returns (array, encoding); pure ASCII text uses one byte per character.
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8), 'ascii'
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32), 'utf-32-le'
+
+def array_to_text(array, encoding):
+    """Inverse of text_to_array."""
+    return np.ascontiguousarray(array).tobytes().decode(encoding)
+
+def _index_dtype(n):
+    """Smallest integer type that can index n positions (keeps the permutations compact)."""
+    return np.int32 if n < 2 ** 31 else np.int64
+
+def zigzag_destination(i, n, rails):
+    """
+    Closed-form Rail Fence (zig-zag) stage: the ciphertext position of plaintext
+    index i in a text of length n. No rails x n grid is built: the rail of every
+    position and its rank within that rail follow directly from its place in the
+    2 * (rails - 1) cycle. 'i' and 'rails' are broadcast against each other, so
+    several rail counts can be evaluated in one call.
+    """
+    i = np.asarray(i, dtype=np.int64)
+    cycle = np.maximum(2 * (rails - 1), 1)
+    q, k = np.divmod(i, cycle)
+
+    # 1. Rail of each position: down the rails, then back up
+    rail = np.where(k < rails, k, cycle - k)
+
+    # 2. Rank of each position within its rail: the top and bottom rails are hit
+    #    once per cycle, the middle rails twice (once going down, once going up)
+    middle = (rail > 0) & (rail < rails - 1)
+    rank = np.where(middle, 2 * q + (k >= rails), q)
+
+    # 3. Start of the rail = characters on the rails above it: 2 * rail - 1 per
+    #    full cycle, plus those among the 'rest' positions of the last partial cycle
+    full, rest = np.divmod(n, cycle)
+    rail_start = (np.where(rail > 0, full * (2 * rail - 1), 0) + np.minimum(rest, rail)
+                  + np.maximum(rest - (cycle - rail + 1), 0))
+    return rail_start + rank
+
+def columnar_destination(i, n, rails):
+    """
+    Simplified columnar stage: character i goes to block i % rails and the blocks
+    are read one after another. Returns the ciphertext position of index i.
+    """
+    i = np.asarray(i, dtype=np.int64)
+    block = i % rails
+    size, extra = np.divmod(n, rails)
+    return block * size + np.minimum(block, extra) + i // rails
+
+def row_column_destination(i, n, rows):
+    """
+    Row-column transposition stage: the text is written row by row into a grid of
+    'rows' rows and read column by column. When n is not a multiple of rows the
+    empty cells at the end are skipped rather than padded, which keeps the stage
+    a permutation of length n. Returns the ciphertext position of index i.
+    """
+    i = np.asarray(i, dtype=np.int64)
+    columns = np.maximum(-(-n // rows), 1)
+    row, column = np.divmod(i, columns)
+    # The first 'extra' columns hold 'size' + 1 characters, the others 'size'
+    size, extra = np.divmod(n, columns)
+    return column * size + np.minimum(column, extra) + row
+
+def _stage_permutation(destination, n, rails):
+    """Permutation 'order' of one stage, so that ciphertext = text[order]."""
+    return inverse_permutation(destination(np.arange(n), n, rails).astype(_index_dtype(n)))
+
+def zigzag_permutation(n, rails):
+    """Rail Fence permutation for a text of length n: ciphertext = plaintext[order]."""
+    return _stage_permutation(zigzag_destination, n, rails)
+
+def columnar_permutation(n, rails):
+    """Permutation of the simplified columnar stage: ciphertext = text[order]."""
+    return _stage_permutation(columnar_destination, n, rails)
+
+def row_column_permutation(n, rows):
+    """Permutation of the row-column transposition: ciphertext = text[order]."""
+    return _stage_permutation(row_column_destination, n, rows)
+
+# Stage name -> function(i, n, rails) returning the output position of input index i
+STAGES = {
+    'zigzag': zigzag_destination,
+    'columnar': columnar_destination,
+    'rowcolumn': row_column_destination,
+}
+
+# Rail Fence followed by the columnar read, as used by the double rail fence ciphers
+DOUBLE_RAIL_FENCE = ('zigzag', 'columnar')
+
+def inverse_permutation(order):
+    """Returns inverse such that inverse[order] = arange(n); plaintext = ciphertext[inverse]."""
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order), dtype=order.dtype)
+    return inverse
+
+def rail_fence_encrypt(text, rails):
+    """Rail Fence encryption as one gather: ciphertext = plaintext[order]."""
+    array, encoding = text_to_array(text)
+    return array_to_text(array[zigzag_permutation(len(array), rails)], encoding)
+
+def rail_fence_decrypt(text, rails):
+    """Rail Fence decryption as one gather with the inverse permutation."""
+    array, encoding = text_to_array(text)
+    return array_to_text(array[zigzag_destination(np.arange(len(array)), len(array), rails)], encoding)
+
+def _check_pipeline(rails, stages):
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown transposition stage(s): {', '.join(unknown)}")
+    if rails < 1:
+        raise ValueError("Number of rails must be at least 1.")
+
+def pipeline_destination(i, n, rails, stages=DOUBLE_RAIL_FENCE):
+    """
+    Ciphertext positions of the text indices i after the whole pipeline, without
+    building any permutation: ciphertext[pipeline_destination(i, ...)] = text[i].
+    Like the stage functions, 'i' and 'rails' broadcast against each other.
+    """
+    for stage in stages:
+        i = STAGES[stage](i, n, rails)
+    return np.asarray(i, dtype=np.int64)
+
+def build_permutation(n, rails, stages=DOUBLE_RAIL_FENCE):
+    """The permutation of a whole transposition pipeline for a text of length n (not cached)."""
+    _check_pipeline(rails, stages)
+    return inverse_permutation(build_inverse(n, rails, stages))
+
+def build_inverse(n, rails, stages=DOUBLE_RAIL_FENCE):
+    """
+    The inverse of build_permutation(n, rails, stages), plaintext = ciphertext[inverse].
+    This is just the destination of every index, so nothing has to be inverted.
+    """
+    _check_pipeline(rails, stages)
+    return pipeline_destination(np.arange(n), n, rails, stages).astype(_index_dtype(n))
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+@lru_cache(maxsize=PERMUTATION_CACHE_SIZE)
+def _cached_permutation(n, rails, stages):
+    return _read_only(build_permutation(n, rails, stages))
+
+@lru_cache(maxsize=PERMUTATION_CACHE_SIZE)
+def _cached_inverse(n, rails, stages):
+    return _read_only(build_inverse(n, rails, stages))
+
+def pipeline_permutation(n, rails, stages=DOUBLE_RAIL_FENCE):
+    """
+    build_permutation(n, rails, stages), cached per (n, rails, stages) when
+    n <= CACHE_MAX_LENGTH. The array is read-only since it may be shared.
+    """
+    if n > CACHE_MAX_LENGTH:
+        return _read_only(build_permutation(n, rails, stages))
+    return _cached_permutation(n, rails, stages)
+
+def pipeline_inverse(n, rails, stages=DOUBLE_RAIL_FENCE):
+    """Inverse of pipeline_permutation(n, rails, stages), cached the same way."""
+    if n > CACHE_MAX_LENGTH:
+        return _read_only(build_inverse(n, rails, stages))
+    return _cached_inverse(n, rails, stages)
+
+def transpose(text, rails, stages=DOUBLE_RAIL_FENCE, mode='encrypt'):
+    """
+    Runs a transposition pipeline over 'text' as a single gather.
+    mode='encrypt' applies the stages in order, mode='decrypt' undoes them.
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError("Mode must be 'encrypt' or 'decrypt'.")
+    stages = tuple(stages)
+    array, encoding = text_to_array(text)
+    if mode == 'encrypt':
+        order = pipeline_permutation(len(array), rails, stages)
+    else:
+        order = pipeline_inverse(len(array), rails, stages)
+    return array_to_text(array[order], encoding)
+
+def _transpose_blocks(args):
+    """
+    Worker: transposes blocks [first, last) of the input file into the output file.
+    Both files are memory-mapped here, so each process only touches its own blocks.
+    Blocks are larger than CACHE_MAX_LENGTH, so the permutation of each block
+    length (the full size, and the shorter last block) is kept here instead.
+    """
+    input_path, output_path, rails, stages, mode, block_size, first, last = args
+    size = os.path.getsize(input_path)
+    with open(input_path, 'rb') as src, open(output_path, 'r+b') as dst, \
+         mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as src_map, \
+         mmap.mmap(dst.fileno(), size, access=mmap.ACCESS_WRITE) as dst_map:
+        source = np.frombuffer(src_map, dtype=np.uint8)
+        target = np.frombuffer(dst_map, dtype=np.uint8)
+        orders = {}
+        for block in range(first, last):
+            start = block * block_size
+            end = min(start + block_size, size)
+            if end - start not in orders:
+                build = build_permutation if mode == 'encrypt' else build_inverse
+                orders[end - start] = build(end - start, rails, stages)
+            np.take(source[start:end], orders[end - start], out=target[start:end])
+        # Release the NumPy views before the maps are closed
+        del source, target, orders
+        dst_map.flush()
+
+def transpose_file(input_path, output_path, rails, stages=DOUBLE_RAIL_FENCE, mode='encrypt',
+                   block_size=BLOCK_SIZE, workers=None):
+    """
+    Transposes a file of any size block by block, working on bytes.
+
+    The input is memory-mapped read-only and the output is preallocated to the
+    same size and memory-mapped for writing. The file is cut into fixed-size
+    blocks (rounded down to a multiple of rails, so every full block is a whole
+    grid) and each block goes through the pipeline independently, so blocks are
+    spread over a process pool. Decrypt with the same rails, stages and block_size.
+
+    :return: Number of bytes processed.
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError("Mode must be 'encrypt' or 'decrypt'.")
+    if rails < 1:
+        raise ValueError("Number of rails must be at least 1.")
+    stages = tuple(stages)
+    block_size = max(block_size - block_size % rails, rails)
+
+    size = os.path.getsize(input_path)
+    with open(output_path, 'w+b') as dst:
+        # Preallocate the output so it can be memory-mapped
+        dst.truncate(size)
+    if size == 0:
+        return 0
+
+    blocks = -(-size // block_size)
+    workers = min(workers or os.cpu_count() or 1, blocks)
+    # Contiguous runs of blocks, one per worker
+    bounds = np.linspace(0, blocks, workers + 1).astype(int)
+    tasks = [(input_path, output_path, rails, stages, mode, block_size, int(first), int(last))
+             for first, last in zip(bounds[:-1], bounds[1:])]
+    if workers == 1:
+        for task in tasks:
+            _transpose_blocks(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_transpose_blocks, tasks))
+    return size
+
+def _score_rails(args):
+    """
+    Worker: decrypts the ciphertext with every rail count in 'rails_values' and
+    returns a list of (score, rails). The score is the mean quadgram log-probability
+    of the first SCORE_PREFIX characters, so it does not depend on the text length.
+
+    Only those characters are decrypted: their ciphertext positions come from the
+    closed-form stages for a whole batch of rail counts at once, so each candidate
+    costs O(SCORE_PREFIX) however long the ciphertext is.
+    """
+    chars, encoding, rails_values, stages, counts_path = args
+    log_probs = ngram_log_probabilities(NGRAM_SIZE, counts_path)
+    n = len(chars)
+    prefix = np.arange(min(n, SCORE_PREFIX), dtype=np.int64)
+    batch = max(1, SCORE_BATCH_CHARS // max(len(prefix), 1))
+
+    results = []
+    for start in range(0, len(rails_values), batch):
+        rails = rails_values[start:start + batch]
+        # plaintext[j] = ciphertext[destination of j], one row per rail count
+        candidates = chars[pipeline_destination(prefix, n, np.array(rails)[:, None], stages)]
+        for r, candidate in zip(rails, candidates):
+            codes = ngram_codes(text_to_indices(array_to_text(candidate, encoding)), NGRAM_SIZE)
+            results.append((float(log_probs[codes].mean()) if len(codes) else float('-inf'), r))
+    return results
+
+def crack_rails(ciphertext, stages=DOUBLE_RAIL_FENCE, min_rails=2, max_rails=None, top=TOP_CANDIDATES,
+                workers=None, counts_path=None):
+    """
+    Brute-forces an unknown rail count: decrypts with every rails value from
+    min_rails to max_rails (default len(ciphertext) - 1), scores each candidate
+    plaintext against English quadgram statistics and ranks them.
+
+    Only a prefix of each candidate is decrypted and scored, so the search is
+    linear in the number of rail counts; rail counts are spread across a process
+    pool. Only the top candidates are decrypted in full. counts_path optionally
+    points to a quadgram counts file (see english_stats.load_ngram_counts).
+
+    Returns a list of up to 'top' (rails, score, plaintext) tuples, best first.
+    """
+    stages = tuple(stages)
+    _check_pipeline(min_rails, stages)
+    chars, encoding = text_to_array(ciphertext)
+    n = len(chars)
+    max_rails = n - 1 if max_rails is None else min(max_rails, n - 1)
+    if max_rails < min_rails:
+        raise ValueError("Ciphertext is too short to try any rail count.")
+
+    candidates = list(range(min_rails, max_rails + 1))
+    workers = min(workers or os.cpu_count() or 1, len(candidates))
+    tasks = [(chars, encoding, candidates[w::workers], stages, counts_path) for w in range(workers)]
+    if workers == 1:
+        results = [_score_rails(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_rails, tasks))
+
+    ranked = sorted((result for batch in results for result in batch), key=lambda result: (-result[0], result[1]))
+    return [(rails, score, array_to_text(chars[pipeline_inverse(n, rails, stages)], encoding))
+            for score, rails in ranked[:top]]